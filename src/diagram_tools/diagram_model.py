@@ -1,9 +1,12 @@
 """Data models for diagram generation."""
 
 from dataclasses import dataclass, field
+from operator import attrgetter
 from typing import List, Optional
 from enum import Enum
 
+from sv_to_ipxact.compat import DATACLASS_SLOTS
+
 
 class PortType(Enum):
     """Classification of port types for styling."""
@@ -19,7 +22,8 @@ class PortDirection(Enum):
     INOUT = "inout"
 
 
-@dataclass
+# Slotted: many ports are created per file and read in sort keys
+@dataclass(**DATACLASS_SLOTS)
 class DiagramPort:
     """Represents a port/interface to display on the diagram."""
     name: str
@@ -57,26 +61,34 @@ class DiagramPort:
 
         Order: clock -> reset -> data -> inout
         """
-        direction_order = {
-            PortDirection.INPUT: 0,
-            PortDirection.OUTPUT: 1,
-            PortDirection.INOUT: 2,
-        }
-        # For inputs: clock first, then reset, then others
-        if self.direction == PortDirection.INPUT:
-            if self.is_clock:
-                return (0, 0, self.name)
-            elif self.is_reset:
-                return (0, 1, self.name)
-            else:
-                return (0, 2, self.name)
-        elif self.direction == PortDirection.INOUT:
-            return (0, 3, self.name)  # inout at bottom of left side
+        return port_sort_key(self)
+
+
+# (side, rank) for non-input directions; inputs are ranked by clock/reset
+_DIRECTION_ORDER = {
+    PortDirection.INOUT: (0, 3),   # inout at bottom of left side
+    PortDirection.OUTPUT: (1, 0),  # outputs on right
+}
+
+
+def port_sort_key(port: DiagramPort) -> tuple:
+    """Return sort key for ordering ports, for use as ``sorted(key=...)``.
+
+    Order: clock -> reset -> data -> inout
+    """
+    # For inputs: clock first, then reset, then others
+    if port.direction == PortDirection.INPUT:
+        if port.is_clock:
+            return (0, 0, port.name)
+        elif port.is_reset:
+            return (0, 1, port.name)
         else:
-            return (1, 0, self.name)  # outputs on right
+            return (0, 2, port.name)
+    side, rank = _DIRECTION_ORDER[port.direction]
+    return (side, rank, port.name)
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class DiagramBlock:
     """Represents a module/component block."""
     name: str
@@ -93,16 +105,18 @@ class DiagramBlock:
         """Return ports for left side (inputs + inouts), sorted."""
         ports = [p for p in self.ports
                  if p.direction in (PortDirection.INPUT, PortDirection.INOUT)]
-        return sorted(ports, key=lambda p: p.sort_key)
+        ports.sort(key=port_sort_key)
+        return ports
 
     @property
     def right_ports(self) -> List[DiagramPort]:
         """Return ports for right side (outputs), sorted."""
         ports = [p for p in self.ports if p.direction == PortDirection.OUTPUT]
-        return sorted(ports, key=lambda p: p.name)
+        ports.sort(key=attrgetter('name'))
+        return ports
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class DiagramConfig:
     """Configuration for diagram generation."""
     # Block dimensions
@@ -2,24 +2,62 @@
 
 from lxml import etree
 import base64
+import io
 import zlib
 from urllib.parse import quote
+from typing import List
+from xml.sax.saxutils import escape
 
 from .diagram_model import DiagramBlock, DiagramPort, DiagramConfig, PortType, PortDirection
 
 
+def _fmt(value: float) -> str:
+    """Format a geometry value, dropping the '.0' of integral floats."""
+    if isinstance(value, int) or value.is_integer():
+        return '%d' % value
+    return repr(value)
+
+
 class DrawioGenerator:
     """Generate draw.io XML from DiagramBlock."""
 
-    def __init__(self, config: DiagramConfig = None):
+    # Port stubs are the most repeated cell; parsing one filled-in template
+    # is cheaper than building the four elements one SubElement at a time.
+    _PORT_LINE_TEMPLATE = (
+        '<mxCell id="{id}" value="" style="{style}" edge="1" parent="1">'
+        '<mxGeometry relative="1" as="geometry">'
+        '<mxPoint x="{x1}" y="{y1}" as="sourcePoint"/>'
+        '<mxPoint x="{x2}" y="{y2}" as="targetPoint"/>'
+        '</mxGeometry>'
+        '</mxCell>'
+    )
+
+    def __init__(self, config: DiagramConfig = None, pretty: bool = False):
         """Initialize generator with configuration.
 
         Args:
             config: Diagram configuration settings
+            pretty: Indent the XML for human readers (draw.io does not need it)
         """
         self.config = config or DiagramConfig()
+        self.pretty = pretty
         self.cell_id_counter = 2  # 0 and 1 are reserved
 
+        # Styles depend only on the config and port type/direction, so
+        # build every combination once instead of per port.
+        self._line_styles = {
+            (port_type, direction): self._build_line_style(port_type, direction)
+            for port_type in PortType
+            for direction in PortDirection
+        }
+        # Attribute-escaped copies for the port line template
+        self._line_style_attrs = {
+            key: escape(style, {'"': '&quot;'})
+            for key, style in self._line_styles.items()
+        }
+        self._label_style_left = self._build_label_style("right")
+        self._label_style_right = self._build_label_style("left")
+
     def _next_id(self) -> str:
         """Generate unique cell ID."""
         cell_id = str(self.cell_id_counter)
@@ -40,31 +78,37 @@ class DrawioGenerator:
         char_width = self.config.font_size * 0.6
         return len(text) * char_width + 10
 
-    def _calculate_dimensions(self, block: DiagramBlock) -> tuple:
+    def _calculate_dimensions(self, block: DiagramBlock,
+                              left_ports: List[DiagramPort],
+                              right_ports: List[DiagramPort]) -> tuple:
         """Calculate block dimensions based on port count and label lengths.
 
+        Args:
+            block: DiagramBlock being rendered
+            left_ports: Sorted ports for the left side
+            right_ports: Sorted ports for the right side
+
         Returns:
             Tuple of (block_width, block_height, margin_left, margin_right)
         """
-        left_count = len(block.left_ports)
-        right_count = len(block.right_ports)
-        max_ports = max(left_count, right_count, 1)
+        max_ports = max(len(left_ports), len(right_ports), 1)
 
         block_height = (self.config.block_padding * 2 +
                         max_ports * self.config.port_spacing + 30)
 
         block_width = self.config.block_min_width
 
-        # Calculate required margins based on longest labels
+        # Calculate required margins based on longest labels.
+        # Width is linear in label length, so only the longest label matters.
         max_left_label_width = 0
-        for port in block.left_ports:
-            label_width = self._estimate_text_width(port.display_name)
-            max_left_label_width = max(max_left_label_width, label_width)
+        if left_ports:
+            longest = max((p.display_name for p in left_ports), key=len)
+            max_left_label_width = self._estimate_text_width(longest)
 
         max_right_label_width = 0
-        for port in block.right_ports:
-            label_width = self._estimate_text_width(port.display_name)
-            max_right_label_width = max(max_right_label_width, label_width)
+        if right_ports:
+            longest = max((p.display_name for p in right_ports), key=len)
+            max_right_label_width = self._estimate_text_width(longest)
 
         # Add port_stub_length and some padding
         margin_left = max(self.config.margin_left,
@@ -83,12 +127,39 @@ class DrawioGenerator:
         Returns:
             draw.io XML as string
         """
+        buffer = io.BytesIO()
+        self._write(buffer, block)
+        return buffer.getvalue().decode('utf-8')
+
+    def write_to_file(self, block: DiagramBlock, output_path: str):
+        """Write diagram to file.
+
+        Args:
+            block: DiagramBlock to render
+            output_path: Output file path
+        """
+        self._write(output_path, block)
+
+    def _write(self, output, block: DiagramBlock):
+        """Stream draw.io XML to a file path or binary file object.
+
+        Cells are serialized as soon as they are built, so no tree for the
+        whole diagram is held in memory.
+
+        Args:
+            output: Output file path or writable binary file object
+            block: DiagramBlock to render
+        """
         # Reset ID counter
         self.cell_id_counter = 2
 
+        # Filter and sort each side once for both layout and rendering
+        left_ports = block.left_ports
+        right_ports = block.right_ports
+
         # Calculate dimensions
         block_width, block_height, margin_left, margin_right = \
-            self._calculate_dimensions(block)
+            self._calculate_dimensions(block, left_ports, right_ports)
 
         # Update block dimensions
         block.width = block_width
@@ -96,67 +167,72 @@ class DrawioGenerator:
         block.x = margin_left
         block.y = self.config.margin_top
 
-        # Create root structure
-        mxfile = etree.Element("mxfile", {
-            "host": "diagram_tools",
-            "modified": "",
-            "agent": "diagram_tools",
-            "version": "1.0",
-            "type": "device",
-        })
-
-        diagram = etree.SubElement(mxfile, "diagram", {
-            "name": block.name,
-            "id": "diagram-1",
-        })
-
-        graph_model = etree.SubElement(diagram, "mxGraphModel", {
-            "dx": "0",
-            "dy": "0",
-            "grid": "1",
-            "gridSize": "10",
-            "guides": "1",
-            "tooltips": "1",
-            "connect": "1",
-            "arrows": "1",
-            "fold": "1",
-            "page": "1",
-            "pageScale": "1",
-            "pageWidth": "850",
-            "pageHeight": "1100",
-            "math": "0",
-            "shadow": "0",
-        })
-
-        root = etree.SubElement(graph_model, "root")
-
-        # Add required base cells
-        etree.SubElement(root, "mxCell", {"id": "0"})
-        etree.SubElement(root, "mxCell", {"id": "1", "parent": "0"})
-
-        # Add main block
-        self._add_block(root, block)
-
-        # Add ports
-        self._add_left_ports(root, block)
-        self._add_right_ports(root, block)
-
-        # Generate XML string
-        return etree.tostring(mxfile, pretty_print=True,
-                              xml_declaration=True, encoding='UTF-8').decode()
-
-    def write_to_file(self, block: DiagramBlock, output_path: str):
-        """Write diagram to file.
-
-        Args:
-            block: DiagramBlock to render
-            output_path: Output file path
-        """
-        xml_content = self.generate(block)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(xml_content)
-
-    def _add_block(self, parent: etree._Element, block: DiagramBlock):
+        with etree.xmlfile(output, encoding='UTF-8') as xf:
+            xf.write_declaration()
+
+            # Create root structure
+            with xf.element("mxfile", {
+                "host": "diagram_tools",
+                "modified": "",
+                "agent": "diagram_tools",
+                "version": "1.0",
+                "type": "device",
+            }):
+                self._indent(xf, 1)
+                with xf.element("diagram", {
+                    "name": block.name,
+                    "id": "diagram-1",
+                }):
+                    self._indent(xf, 2)
+                    with xf.element("mxGraphModel", {
+                        "dx": "0",
+                        "dy": "0",
+                        "grid": "1",
+                        "gridSize": "10",
+                        "guides": "1",
+                        "tooltips": "1",
+                        "connect": "1",
+                        "arrows": "1",
+                        "fold": "1",
+                        "page": "1",
+                        "pageScale": "1",
+                        "pageWidth": "850",
+                        "pageHeight": "1100",
+                        "math": "0",
+                        "shadow": "0",
+                    }):
+                        self._indent(xf, 3)
+                        with xf.element("root"):
+                            # Add required base cells
+                            element = etree.Element
+                            self._write_cell(xf, element("mxCell", {"id": "0"}))
+                            self._write_cell(xf, element("mxCell", {"id": "1", "parent": "0"}))
+
+                            # Add main block
+                            self._add_block(xf, block)
+
+                            # Add ports
+                            self._add_left_ports(xf, block, left_ports)
+                            self._add_right_ports(xf, block, right_ports)
+                            self._indent(xf, 3)
+                        self._indent(xf, 2)
+                    self._indent(xf, 1)
+                self._indent(xf, 0)
+
+    def _indent(self, xf, level: int):
+        """Start a new line at the given nesting level in pretty output."""
+        if self.pretty:
+            xf.write("\n" + "  " * level)
+
+    def _write_cell(self, xf, cell: etree._Element):
+        """Serialize a finished cell to the incremental writer."""
+        if self.pretty:
+            # Cells sit at depth 4 (mxfile/diagram/mxGraphModel/root)
+            self._indent(xf, 4)
+            etree.indent(cell, level=4)
+        xf.write(cell)
+
+    def _add_block(self, xf, block: DiagramBlock):
         """Add main block rectangle."""
         style = (
             "rounded=0;"
@@ -168,7 +244,7 @@ class DrawioGenerator:
             "verticalAlign=top;"
         )
 
-        cell = etree.SubElement(parent, "mxCell", {
+        cell = etree.Element("mxCell", {
             "id": self._next_id(),
             "value": block.name,
             "style": style,
@@ -177,30 +253,37 @@ class DrawioGenerator:
         })
 
         etree.SubElement(cell, "mxGeometry", {
-            "x": str(block.x),
-            "y": str(block.y),
-            "width": str(block.width),
-            "height": str(block.height),
+            "x": _fmt(block.x),
+            "y": _fmt(block.y),
+            "width": _fmt(block.width),
+            "height": _fmt(block.height),
             "as": "geometry",
         })
 
+        self._write_cell(xf, cell)
+
     def _get_line_style(self, port: DiagramPort) -> str:
         """Get draw.io style string for port line."""
-        if port.port_type == PortType.INTERFACE:
+        return self._line_styles[(port.port_type, port.direction)]
+
+    def _build_line_style(self, port_type: PortType,
+                          direction: PortDirection) -> str:
+        """Build draw.io style string for a port line type and direction."""
+        if port_type == PortType.INTERFACE:
             stroke_width = self.config.interface_line_width
-        elif port.port_type == PortType.BUS:
+        elif port_type == PortType.BUS:
             stroke_width = self.config.bus_line_width
         else:
             stroke_width = self.config.signal_line_width
 
         # Determine arrow style based on direction
-        if port.direction == PortDirection.INPUT:
+        if direction == PortDirection.INPUT:
             # Input: arrow pointing right (into block)
             arrow_style = "endArrow=classic;startArrow=none;"
-        elif port.direction == PortDirection.OUTPUT:
+        elif direction == PortDirection.OUTPUT:
             # Output: arrow pointing right (out of block)
             arrow_style = "endArrow=classic;startArrow=none;"
-        elif port.direction == PortDirection.INOUT:
+        elif direction == PortDirection.INOUT:
             # Inout: arrows on both ends (smaller)
             arrow_style = "endArrow=classic;startArrow=classic;"
         else:
@@ -213,47 +296,23 @@ class DrawioGenerator:
             f"strokeColor={self.config.port_stroke_color};"
         )
 
-    def _add_port_line(self, parent: etree._Element, port: DiagramPort,
+    def _add_port_line(self, xf, port: DiagramPort,
                        x1: float, y1: float, x2: float, y2: float):
         """Add port stub line."""
-        style = self._get_line_style(port)
-
-        cell = etree.SubElement(parent, "mxCell", {
-            "id": self._next_id(),
-            "value": "",
-            "style": style,
-            "edge": "1",
-            "parent": "1",
-        })
-
-        geom = etree.SubElement(cell, "mxGeometry", {
-            "relative": "1",
-            "as": "geometry",
-        })
-
-        etree.SubElement(geom, "mxPoint", {
-            "x": str(x1),
-            "y": str(y1),
-            "as": "sourcePoint",
-        })
-
-        etree.SubElement(geom, "mxPoint", {
-            "x": str(x2),
-            "y": str(y2),
-            "as": "targetPoint",
-        })
-
-    def _add_port_label(self, parent: etree._Element, port: DiagramPort,
-                        x: float, y: float, is_left: bool):
-        """Add port name label."""
-        if is_left:
-            align = "right"
-            label_x = x - 5
-        else:
-            align = "left"
-            label_x = x + 5
-
-        style = (
+        cell = etree.fromstring(self._PORT_LINE_TEMPLATE.format(
+            id=self._next_id(),
+            style=self._line_style_attrs[(port.port_type, port.direction)],
+            x1=_fmt(x1),
+            y1=_fmt(y1),
+            x2=_fmt(x2),
+            y2=_fmt(y2),
+        ))
+
+        self._write_cell(xf, cell)
+
+    def _build_label_style(self, align: str) -> str:
+        """Build draw.io style string for a port label."""
+        return (
             "text;"
             "html=1;"
             f"align={align};"
@@ -265,7 +324,17 @@ class DrawioGenerator:
             f"fontSize={self.config.font_size};"
         )
 
-        cell = etree.SubElement(parent, "mxCell", {
+    def _add_port_label(self, xf, port: DiagramPort,
+                        x: float, y: float, is_left: bool):
+        """Add port name label."""
+        if is_left:
+            style = self._label_style_left
+            label_x = x - 5
+        else:
+            style = self._label_style_right
+            label_x = x + 5
+
+        cell = etree.Element("mxCell", {
             "id": self._next_id(),
             "value": port.display_name,
             "style": style,
@@ -283,39 +352,41 @@ class DrawioGenerator:
             geom_x = label_x
 
         etree.SubElement(cell, "mxGeometry", {
-            "x": str(geom_x),
-            "y": str(y - label_height / 2),
-            "width": str(label_width),
-            "height": str(label_height),
+            "x": _fmt(geom_x),
+            "y": _fmt(y - label_height / 2),
+            "width": _fmt(label_width),
+            "height": _fmt(label_height),
             "as": "geometry",
         })
 
-    def _add_left_ports(self, parent: etree._Element, block: DiagramBlock):
+        self._write_cell(xf, cell)
+
+    def _add_left_ports(self, xf, block: DiagramBlock,
+                        ports: List[DiagramPort]):
         """Add input and inout ports on the left side."""
-        ports = block.left_ports
         start_y = block.y + self.config.block_padding + 30
+        spacing = self.config.port_spacing
 
-        for i, port in enumerate(ports):
-            y = start_y + i * self.config.port_spacing
-
-            # Port stub line
-            x1 = block.x - self.config.port_stub_length
-            x2 = block.x
+        # Port stub line (same x span for every port on this side)
+        x1 = block.x - self.config.port_stub_length
+        x2 = block.x
 
-            self._add_port_line(parent, port, x1, y, x2, y)
-            self._add_port_label(parent, port, x1, y, is_left=True)
+        for i, port in enumerate(ports):
+            y = start_y + i * spacing
+            self._add_port_line(xf, port, x1, y, x2, y)
+            self._add_port_label(xf, port, x1, y, is_left=True)
 
-    def _add_right_ports(self, parent: etree._Element, block: DiagramBlock):
+    def _add_right_ports(self, xf, block: DiagramBlock,
+                         ports: List[DiagramPort]):
         """Add output ports on the right side."""
-        ports = block.right_ports
         start_y = block.y + self.config.block_padding + 30
+        spacing = self.config.port_spacing
 
-        for i, port in enumerate(ports):
-            y = start_y + i * self.config.port_spacing
-
-            # Port stub line
-            x1 = block.x + block.width
-            x2 = x1 + self.config.port_stub_length
+        # Port stub line (same x span for every port on this side)
+        x1 = block.x + block.width
+        x2 = x1 + self.config.port_stub_length
 
-            self._add_port_line(parent, port, x1, y, x2, y)
-            self._add_port_label(parent, port, x2, y, is_left=False)
+        for i, port in enumerate(ports):
+            y = start_y + i * spacing
+            self._add_port_line(xf, port, x1, y, x2, y)
+            self._add_port_label(xf, port, x2, y, is_left=False)
@@ -1,11 +1,48 @@
 """Extract diagram model from IP-XACT component files."""
 
-from typing import List, Dict, Optional, Set
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
+from typing import Iterable, List, Optional, Set
 from lxml import etree
 
 from .diagram_model import DiagramPort, DiagramBlock, PortType, PortDirection
 
 
+@dataclass(frozen=True)
+class _Tags:
+    """Clark-notation (``{uri}local``) tag names for one IP-XACT namespace.
+
+    Using Clark names with ``find``/``iter`` lets lxml skip prefix parsing
+    and namespace-map lookups on every call.
+    """
+    name: str
+    library: str
+    busInterfaces: str
+    busInterface: str
+    master: str
+    slave: str
+    mirroredMaster: str
+    mirroredSlave: str
+    busType: str
+    portMap: str
+    physicalPort: str
+    model: str
+    ports: str
+    port: str
+    wire: str
+    direction: str
+    vector: str
+    left: str
+    right: str
+
+    @classmethod
+    def for_namespace(cls, uri: str) -> '_Tags':
+        """Build the tag set for a namespace URI."""
+        return cls(**{f.name: f'{{{uri}}}{f.name}' for f in fields(cls)})
+
+
 class IPXACTDiagramExtractor:
     """Extract diagram model from IP-XACT component files."""
 
@@ -21,12 +58,39 @@ class IPXACTDiagramExtractor:
         },
     }
 
+    # Namespace URI -> version, for O(1) version detection
+    _URI_TO_VERSION = {
+        uri: version
+        for version, namespaces in NAMESPACES.items()
+        for uri in namespaces.values()
+    }
+
+    # Tag names per version, built once and shared by every extract() call
+    _TAGS = {
+        version: _Tags.for_namespace(uri)
+        for version, namespaces in NAMESPACES.items()
+        for uri in namespaces.values()
+    }
+
+    # Parser options: drop indentation-only text nodes, skip the ID map and
+    # never expand entities (also closes XXE)
+    _PARSE_OPTIONS = {
+        'remove_blank_text': True,
+        'collect_ids': False,
+        'huge_tree': False,
+        'resolve_entities': False,
+    }
+
     # Common clock signal patterns
-    CLOCK_PATTERNS = ['clk', 'clock', 'aclk', 'pclk', 'hclk', 'sclk', 'fclk']
+    CLOCK_PATTERNS = ('clk', 'clock', 'aclk', 'pclk', 'hclk', 'sclk', 'fclk')
 
     # Common reset signal patterns
-    RESET_PATTERNS = ['rst', 'reset', 'arst', 'aresetn', 'rst_n', 'rstn',
-                      'presetn', 'hresetn', 'sresetn']
+    RESET_PATTERNS = ('rst', 'reset', 'arst', 'aresetn', 'rst_n', 'rstn',
+                      'presetn', 'hresetn', 'sresetn')
+
+    # Precompiled alternations of the patterns above (case-insensitive)
+    _CLOCK_RE = re.compile('|'.join(map(re.escape, CLOCK_PATTERNS)), re.IGNORECASE)
+    _RESET_RE = re.compile('|'.join(map(re.escape, RESET_PATTERNS)), re.IGNORECASE)
 
     def __init__(self):
         """Initialize the extractor."""
@@ -34,23 +98,16 @@ class IPXACTDiagramExtractor:
 
     def _detect_version(self, root: etree._Element) -> str:
         """Detect IP-XACT version from namespace."""
-        ns = root.nsmap.get(None, '')  # Default namespace
-
-        if 'SPIRIT' in ns or '1685-2009' in ns:
-            return '2009'
-        elif '1685-2014' in ns:
-            return '2014'
-        elif '1685-2022' in ns:
-            return '2022'
-        else:
-            # Try to detect from prefixed namespaces
-            for prefix, uri in root.nsmap.items():
-                if 'SPIRIT' in uri or '1685-2009' in uri:
-                    return '2009'
-                elif '1685-2014' in uri:
-                    return '2014'
-                elif '1685-2022' in uri:
-                    return '2022'
+        # The root element's own namespace normally decides
+        version = self._URI_TO_VERSION.get(etree.QName(root).namespace)
+        if version is not None:
+            return version
+
+        # Try the other declared namespaces
+        for uri in root.nsmap.values():
+            version = self._URI_TO_VERSION.get(uri)
+            if version is not None:
+                return version
 
         # Default to 2009
         return '2009'
@@ -62,146 +119,135 @@ class IPXACTDiagramExtractor:
         else:
             return 'ipxact', self.NAMESPACES.get(version, self.NAMESPACES['2014'])
 
+    def _get_tags(self, version: str) -> _Tags:
+        """Get Clark-notation tag names for the given version."""
+        tags = self._TAGS.get(version)
+        if tags is None:
+            prefix, nsmap = self._get_prefix_and_ns(version)
+            tags = _Tags.for_namespace(nsmap[prefix])
+        return tags
+
     def _is_clock_signal(self, name: str) -> bool:
         """Check if signal name indicates a clock."""
-        name_lower = name.lower()
-        for pattern in self.CLOCK_PATTERNS:
-            if pattern in name_lower:
-                return True
-        return False
+        return self._CLOCK_RE.search(name) is not None
 
     def _is_reset_signal(self, name: str) -> bool:
         """Check if signal name indicates a reset."""
-        name_lower = name.lower()
-        for pattern in self.RESET_PATTERNS:
-            if pattern in name_lower:
-                return True
-        return False
-
-    def _extract_bus_interfaces(self, root: etree._Element, prefix: str,
-                                nsmap: Dict) -> List[DiagramPort]:
-        """Extract bus interfaces as DiagramPort objects."""
-        ports: List[DiagramPort] = []
-        bus_port_names: Set[str] = set()
+        return self._RESET_RE.search(name) is not None
 
-        # Find busInterfaces
-        bus_interfaces = root.xpath(f'//{prefix}:busInterface', namespaces=nsmap)
+    def _extract_bus_interface(self, bus_if: etree._Element, tags: _Tags,
+                               bus_port_names: Set[str]) -> Optional[DiagramPort]:
+        """Convert a single busInterface element into a DiagramPort.
 
-        for bus_if in bus_interfaces:
-            # Get interface name
-            name_elem = bus_if.find(f'{prefix}:name', nsmap)
-            if name_elem is None:
-                continue
-            name = name_elem.text or 'unknown'
-
-            # Determine direction from interface mode
-            master = bus_if.find(f'{prefix}:master', nsmap)
-            slave = bus_if.find(f'{prefix}:slave', nsmap)
-            mirroredMaster = bus_if.find(f'{prefix}:mirroredMaster', nsmap)
-            mirroredSlave = bus_if.find(f'{prefix}:mirroredSlave', nsmap)
-
-            if master is not None or mirroredSlave is not None:
-                direction = PortDirection.OUTPUT
-            else:
-                direction = PortDirection.INPUT
-
-            # Get bus type for protocol name
-            bus_type = bus_if.find(f'{prefix}:busType', nsmap)
-            protocol_name = None
-            if bus_type is not None:
-                protocol_name = bus_type.get('name') or bus_type.get(
-                    f'{{{nsmap[prefix]}}}name')
-
-            # Count port maps
-            port_maps = bus_if.xpath(f'.//{prefix}:portMap', namespaces=nsmap)
-            signal_count = len(port_maps)
-
-            # Collect physical port names
-            for pm in port_maps:
-                phys_port = pm.find(f'.//{prefix}:physicalPort/{prefix}:name', nsmap)
-                if phys_port is not None and phys_port.text:
-                    bus_port_names.add(phys_port.text)
-
-            ports.append(DiagramPort(
-                name=name,
-                direction=direction,
-                port_type=PortType.INTERFACE,
-                signal_count=max(1, signal_count),
-                protocol_name=protocol_name,
-            ))
-
-        return ports, bus_port_names
-
-    def _extract_ports(self, root: etree._Element, prefix: str,
-                       nsmap: Dict, bus_port_names: Set[str]) -> List[DiagramPort]:
-        """Extract remaining ports not in bus interfaces."""
-        ports: List[DiagramPort] = []
-
-        # Find model/ports/port elements
-        port_elements = root.xpath(f'//{prefix}:model/{prefix}:ports/{prefix}:port',
-                                   namespaces=nsmap)
-
-        for port_elem in port_elements:
-            # Get port name
-            name_elem = port_elem.find(f'{prefix}:name', nsmap)
-            if name_elem is None:
-                continue
-            name = name_elem.text or 'unknown'
+        Physical port names referenced by the interface's port maps are added
+        to ``bus_port_names`` so they can be excluded from the signal list.
+        """
+        # Get interface name
+        name_elem = bus_if.find(tags.name)
+        if name_elem is None:
+            return None
+        name = name_elem.text or 'unknown'
+
+        # Determine direction from interface mode
+        master = bus_if.find(tags.master)
+        mirroredSlave = bus_if.find(tags.mirroredSlave)
+
+        if master is not None or mirroredSlave is not None:
+            direction = PortDirection.OUTPUT
+        else:
+            direction = PortDirection.INPUT
 
-            # Skip ports that are part of bus interfaces
-            if name in bus_port_names:
-                continue
+        # Get bus type for protocol name
+        bus_type = bus_if.find(tags.busType)
+        protocol_name = None
+        if bus_type is not None:
+            protocol_name = bus_type.get('name') or bus_type.get(tags.name)
+            if protocol_name:
+                # Few distinct protocols per file; share one string per name
+                protocol_name = sys.intern(protocol_name)
+
+        # Count port maps
+        signal_count = sum(1 for _ in bus_if.iter(tags.portMap))
+
+        # Collect physical port names
+        for phys_port in bus_if.iter(tags.physicalPort):
+            phys_name = phys_port.find(tags.name)
+            if phys_name is not None and phys_name.text:
+                bus_port_names.add(sys.intern(phys_name.text))
+
+        return DiagramPort(
+            name=name,
+            direction=direction,
+            port_type=PortType.INTERFACE,
+            signal_count=max(1, signal_count),
+            protocol_name=protocol_name,
+        )
 
-            # Get direction
-            wire = port_elem.find(f'{prefix}:wire', nsmap)
-            direction = PortDirection.INPUT
-            width = 1
-
-            if wire is not None:
-                dir_elem = wire.find(f'{prefix}:direction', nsmap)
-                if dir_elem is not None:
-                    dir_text = (dir_elem.text or 'in').lower()
-                    if dir_text == 'out':
-                        direction = PortDirection.OUTPUT
-                    elif dir_text == 'inout':
-                        direction = PortDirection.INOUT
-
-                # Get width from vector
-                vector = wire.find(f'{prefix}:vector', nsmap)
-                if vector is not None:
-                    left = vector.find(f'{prefix}:left', nsmap)
-                    right = vector.find(f'{prefix}:right', nsmap)
-                    if left is not None and right is not None:
-                        try:
-                            left_val = int(left.text or '0')
-                            right_val = int(right.text or '0')
-                            width = abs(left_val - right_val) + 1
-                        except ValueError:
-                            width = 1
-
-            # Determine port type
-            port_type = PortType.BUS if width > 1 else PortType.SIGNAL
-
-            ports.append(DiagramPort(
-                name=name,
-                direction=direction,
-                port_type=port_type,
-                width=width,
-                is_clock=self._is_clock_signal(name),
-                is_reset=self._is_reset_signal(name),
-            ))
-
-        return ports
-
-    def _extract_component_name(self, root: etree._Element, prefix: str,
-                                nsmap: Dict) -> str:
+    def _extract_port(self, port_elem: etree._Element,
+                      tags: _Tags) -> Optional[DiagramPort]:
+        """Convert a single model port element into a DiagramPort."""
+        # Get port name
+        name_elem = port_elem.find(tags.name)
+        if name_elem is None:
+            return None
+        # Interned so the bus-signal exclusion compares by identity first
+        name = sys.intern(name_elem.text or 'unknown')
+
+        # Get direction
+        wire = port_elem.find(tags.wire)
+        direction = PortDirection.INPUT
+        width = 1
+
+        if wire is not None:
+            dir_elem = wire.find(tags.direction)
+            if dir_elem is not None:
+                dir_text = (dir_elem.text or 'in').lower()
+                if dir_text == 'out':
+                    direction = PortDirection.OUTPUT
+                elif dir_text == 'inout':
+                    direction = PortDirection.INOUT
+
+            # Get width from vector
+            vector = wire.find(tags.vector)
+            if vector is not None:
+                left = vector.find(tags.left)
+                right = vector.find(tags.right)
+                if left is not None and right is not None:
+                    try:
+                        left_val = int(left.text or '0')
+                        right_val = int(right.text or '0')
+                        width = abs(left_val - right_val) + 1
+                    except ValueError:
+                        width = 1
+
+        # Determine port type
+        port_type = PortType.BUS if width > 1 else PortType.SIGNAL
+
+        return DiagramPort(
+            name=name,
+            direction=direction,
+            port_type=port_type,
+            width=width,
+            is_clock=self._is_clock_signal(name),
+            is_reset=self._is_reset_signal(name),
+        )
+
+    @staticmethod
+    def _release(elem: etree._Element):
+        """Free a fully processed element and its already-visited siblings."""
+        elem.clear(keep_tail=True)
+        parent = elem.getparent()
+        while elem.getprevious() is not None:
+            del parent[0]
+
+    def _extract_component_name(self, root: etree._Element, tags: _Tags) -> str:
         """Extract component name from VLNV."""
-        name_elem = root.find(f'{prefix}:name', nsmap)
+        name_elem = root.find(tags.name)
         if name_elem is not None and name_elem.text:
             return name_elem.text
 
         # Fallback to library name
-        lib_elem = root.find(f'{prefix}:library', nsmap)
+        lib_elem = root.find(tags.library)
         if lib_elem is not None and lib_elem.text:
             return lib_elem.text
 
@@ -216,23 +262,51 @@ class IPXACTDiagramExtractor:
         Returns:
             DiagramBlock with extracted port information
         """
-        # Parse XML
-        tree = etree.parse(ipxact_file)
-        root = tree.getroot()
+        root = None
+        tags: Optional[_Tags] = None
 
-        # Detect version
-        version = self._detect_version(root)
-        prefix, nsmap = self._get_prefix_and_ns(version)
+        interface_ports: List[DiagramPort] = []
+        signal_ports: List[DiagramPort] = []
+        bus_port_names: Set[str] = set()
 
-        # Extract component name
-        name = self._extract_component_name(root, prefix, nsmap)
+        # Single streaming pass: interfaces and ports are converted as soon as
+        # their closing tag is seen, then released to keep memory bounded.
+        for event, elem in etree.iterparse(ipxact_file, events=('start', 'end'),
+                                           **self._PARSE_OPTIONS):
+            if root is None:
+                # Detect version from the root element's namespaces
+                root = elem
+                tags = self._get_tags(self._detect_version(root))
+                continue
 
-        # Extract bus interfaces (and get port names used in them)
-        interface_ports, bus_port_names = self._extract_bus_interfaces(
-            root, prefix, nsmap)
+            if event != 'end':
+                continue
 
-        # Extract remaining ports
-        signal_ports = self._extract_ports(root, prefix, nsmap, bus_port_names)
+            if elem.tag == tags.busInterface:
+                # Only component-level interfaces (component/busInterfaces/*)
+                container = elem.getparent()
+                if container.tag != tags.busInterfaces or container.getparent() is not root:
+                    continue
+                port = self._extract_bus_interface(elem, tags, bus_port_names)
+                if port is not None:
+                    interface_ports.append(port)
+                self._release(elem)
+            elif elem.tag == tags.port:
+                ports = elem.getparent()
+                model = ports.getparent()
+                if ports.tag != tags.ports or model is None or model.tag != tags.model:
+                    continue
+                port = self._extract_port(elem, tags)
+                if port is not None:
+                    signal_ports.append(port)
+                self._release(elem)
+
+        # Extract component name (top-level VLNV elements are never released)
+        name = self._extract_component_name(root, tags)
+
+        # Skip ports that are part of bus interfaces
+        excluded = frozenset(bus_port_names)
+        signal_ports = [p for p in signal_ports if p.name not in excluded]
 
         # Combine all ports
         all_ports = interface_ports + signal_ports
@@ -241,3 +315,20 @@ class IPXACTDiagramExtractor:
             name=name,
             ports=all_ports,
         )
+
+    def extract_many(self, ipxact_files: Iterable[str],
+                     max_workers: Optional[int] = None) -> List[DiagramBlock]:
+        """Extract several IP-XACT files in parallel worker processes.
+
+        Each file is parsed independently, so the work scales with the
+        number of CPU cores.
+
+        Args:
+            ipxact_files: Paths to IP-XACT component files
+            max_workers: Number of worker processes (default: CPU count)
+
+        Returns:
+            DiagramBlocks in the same order as ``ipxact_files``
+        """
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.extract, ipxact_files, chunksize=8))
@@ -6,10 +6,10 @@ import sys
 from pathlib import Path
 
 from .diagram_model import DiagramConfig
-from .sv_diagram_extractor import SVDiagramExtractor
-from .ipxact_diagram_extractor import IPXACTDiagramExtractor
-from .drawio_generator import DrawioGenerator
-from .svg_generator import SVGGenerator
+
+# Extractors and generators are imported where they are used, so a run only
+# loads the input/output path it needs (the SV extractor pulls in the whole
+# sv_to_ipxact package).
 
 
 def detect_input_format(file_path: str) -> str:
@@ -30,10 +30,11 @@ def detect_input_format(file_path: str) -> str:
     if ext in ['.sv', '.v', '.svh', '.vh']:
         return 'sv'
     elif ext in ['.xml', '.ipxact']:
-        # Check content for IP-XACT namespace
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read(1000)
-            if 'SPIRIT' in content or 'IPXACT' in content or 'ipxact' in content:
+        # Check content for IP-XACT namespace (markers are ASCII, so the
+        # raw bytes can be searched without decoding)
+        with open(file_path, 'rb') as f:
+            head = f.read(1024)
+            if b'SPIRIT' in head or b'IPXACT' in head or b'ipxact' in head:
                 return 'ipxact'
 
     raise ValueError(f"Cannot detect format for: {file_path}")
@@ -88,6 +89,11 @@ Output:
         help='Path to library cache file'
     )
 
+    parser.add_argument(
+        '--block-cache',
+        help='SQLite file caching extracted SV diagram data between runs'
+    )
+
     parser.add_argument(
         '--no-match',
         action='store_true',
@@ -129,6 +135,12 @@ Output:
         help='Minimum block width in pixels (default: 200)'
     )
 
+    parser.add_argument(
+        '--pretty',
+        action='store_true',
+        help='Pretty-print draw.io XML output (default: compact)'
+    )
+
     parser.add_argument(
         '-v', '--verbose',
         action='store_true',
@@ -172,11 +184,13 @@ Output:
         print("[1] Extracting diagram data...")
 
         if input_format == 'sv':
-            extractor = SVDiagramExtractor(args.libs, args.cache)
+            from .sv_diagram_extractor import SVDiagramExtractor
+            extractor = SVDiagramExtractor(args.libs, args.cache, args.block_cache)
             block = extractor.extract(args.input,
                                        match_protocols=not args.no_match,
                                        expand_interfaces=not args.no_expand_interfaces)
         else:
+            from .ipxact_diagram_extractor import IPXACTDiagramExtractor
             extractor = IPXACTDiagramExtractor()
             block = extractor.extract(args.input)
 
@@ -205,13 +219,15 @@ Output:
         generated_files = []
 
         if args.format in ['drawio', 'both']:
-            drawio_gen = DrawioGenerator(config)
+            from .drawio_generator import DrawioGenerator
+            drawio_gen = DrawioGenerator(config, pretty=args.pretty)
             drawio_path = str(output_base) + '.drawio'
             drawio_gen.write_to_file(block, drawio_path)
             generated_files.append(drawio_path)
             print(f"    Generated: {drawio_path}")
 
         if args.format in ['svg', 'both']:
+            from .svg_generator import SVGGenerator
             svg_gen = SVGGenerator(config)
             svg_path = str(output_base) + '.svg'
             svg_gen.write_to_file(block, svg_path)
@@ -1,6 +1,14 @@
 """Extract diagram model from SystemVerilog files."""
 
+import hashlib
 import os
+import pickle
+import re
+import sqlite3
+import threading
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional
 
@@ -12,71 +20,116 @@ from sv_to_ipxact.library_parser import LibraryParser
 from sv_to_ipxact.protocol_matcher import ProtocolMatcher
 
 
+# Common clock signal patterns
+CLOCK_PATTERNS = ('clk', 'clock', 'aclk', 'pclk', 'hclk', 'sclk', 'fclk')
+
+# Common reset signal patterns
+RESET_PATTERNS = ('rst', 'reset', 'arst', 'aresetn', 'rst_n', 'rstn',
+                  'presetn', 'hresetn', 'sresetn')
+
+# Precompiled alternations of the patterns above (case-insensitive)
+_CLOCK_RE = re.compile('|'.join(map(re.escape, CLOCK_PATTERNS)), re.IGNORECASE)
+_RESET_RE = re.compile('|'.join(map(re.escape, RESET_PATTERNS)), re.IGNORECASE)
+
+# Version of the pickled DiagramBlock layout; part of the block cache
+# fingerprint so rows written by an older layout are re-extracted
+_BLOCK_FORMAT = 3
+
+# SV direction keyword -> diagram direction
+_DIRECTION_MAP = {
+    'input': PortDirection.INPUT,
+    'output': PortDirection.OUTPUT,
+    'inout': PortDirection.INOUT,
+}
+
+
+# The same port names (clk, rst_n, ...) recur across modules, so cache by
+# name alone rather than per extractor instance.
+@lru_cache(maxsize=4096)
+def _is_clock(name: str) -> bool:
+    """Check if signal name indicates a clock."""
+    return _CLOCK_RE.search(name) is not None
+
+
+@lru_cache(maxsize=4096)
+def _is_reset(name: str) -> bool:
+    """Check if signal name indicates a reset."""
+    return _RESET_RE.search(name) is not None
+
+
 class SVDiagramExtractor:
     """Extract diagram model from SystemVerilog files."""
 
-    # Common clock signal patterns
-    CLOCK_PATTERNS = ['clk', 'clock', 'aclk', 'pclk', 'hclk', 'sclk', 'fclk']
+    CLOCK_PATTERNS = CLOCK_PATTERNS
+    RESET_PATTERNS = RESET_PATTERNS
 
-    # Common reset signal patterns
-    RESET_PATTERNS = ['rst', 'reset', 'arst', 'aresetn', 'rst_n', 'rstn',
-                      'presetn', 'hresetn', 'sresetn']
-
-    def __init__(self, libs_dir: str = "libs", cache_file: str = ".libs_cache.json"):
+    def __init__(self, libs_dir: str = "libs", cache_file: str = ".libs_cache.json",
+                 block_cache: Optional[str] = None):
         """Initialize extractor with library paths.
 
         Args:
             libs_dir: Path to AMBA protocol library directory
             cache_file: Path to library cache file
+            block_cache: Optional SQLite file caching extracted blocks across
+                runs (disabled when None)
         """
         self.libs_dir = libs_dir
         self.cache_file = cache_file
+        self.block_cache = block_cache
         self.lib_parser: Optional[LibraryParser] = None
         self.matcher: Optional[ProtocolMatcher] = None
         self._libs_loaded = False
+        self._libs_lock = threading.Lock()
 
     def _load_library(self):
         """Load protocol library with caching."""
-        if self._libs_loaded:
-            return
+        with self._libs_lock:
+            if not self._libs_loaded:
+                self._load_library_locked()
 
-        # Find libs directory
+    def _find_libs_path(self) -> Path:
+        """Locate the libs directory, falling back to the repository copy."""
         libs_path = Path(self.libs_dir)
         if not libs_path.exists():
             # Try relative to script location
             script_dir = Path(__file__).parent.parent.parent
             libs_path = script_dir / "libs"
+        return libs_path
 
-        if libs_path.exists():
+    def _get_lib_parser(self, libs_path: Path) -> LibraryParser:
+        """Get the library parser, creating it on first use."""
+        if self.lib_parser is None:
             self.lib_parser = LibraryParser(str(libs_path))
-            protocols = self.lib_parser.parse_all_protocols()
+        return self.lib_parser
+
+    def _load_library_locked(self):
+        """Locate and parse the protocol library (caller holds the lock)."""
+        libs_path = self._find_libs_path()
+
+        if libs_path.exists():
+            self.lib_parser = self._get_lib_parser(libs_path)
+            # Reuse the parsed library unless libs/ changed since it was saved
+            if self.lib_parser.load_cache(self.cache_file):
+                protocols = self.lib_parser.protocols
+            else:
+                # In-process: this may run on a background thread, where
+                # forking a worker pool risks deadlocks in the children
+                protocols = self.lib_parser.parse_all_protocols(max_workers=1)
+                self.lib_parser.save_cache(self.cache_file)
             self.matcher = ProtocolMatcher(protocols)
             self._libs_loaded = True
 
     def _is_clock_signal(self, name: str) -> bool:
         """Check if signal name indicates a clock."""
-        name_lower = name.lower()
-        for pattern in self.CLOCK_PATTERNS:
-            if pattern in name_lower:
-                return True
-        return False
+        return _is_clock(name)
 
     def _is_reset_signal(self, name: str) -> bool:
         """Check if signal name indicates a reset."""
-        name_lower = name.lower()
-        for pattern in self.RESET_PATTERNS:
-            if pattern in name_lower:
-                return True
-        return False
+        return _is_reset(name)
 
     def _get_direction(self, port: PortDefinition) -> PortDirection:
         """Convert SV direction to DiagramPort direction."""
-        direction_map = {
-            'input': PortDirection.INPUT,
-            'output': PortDirection.OUTPUT,
-            'inout': PortDirection.INOUT,
-        }
-        return direction_map.get(port.direction.lower(), PortDirection.INPUT)
+        return _DIRECTION_MAP.get(port.direction.lower(), PortDirection.INPUT)
 
     def _get_width(self, port: PortDefinition) -> int:
         """Extract numeric width from port definition."""
@@ -99,10 +152,41 @@ class SVDiagramExtractor:
             is_reset=self._is_reset_signal(port.name),
         )
 
+    def _signal_port(self, port: PortDefinition) -> DiagramPort:
+        """Convert a port shown as an individual signal.
+
+        Reset signals are always drawn as single signals, even when wider
+        than one bit.
+        """
+        diagram_port = self._port_to_diagram_port(port)
+        if diagram_port.is_reset:
+            diagram_port.port_type = PortType.SIGNAL
+        return diagram_port
+
+    def _fingerprint(self, sv_file: str, match_protocols: bool) -> str:
+        """Identify the inputs an extraction depends on.
+
+        Hashes the SV file contents and, when protocol matching uses the
+        library, the sorted (path, mtime) list of library files, so edits,
+        additions, deletions and renames under libs/ all change it.
+        """
+        digest = hashlib.sha256(Path(sv_file).read_bytes())
+        if match_protocols:
+            libs_path = self._find_libs_path()
+            if libs_path.exists():
+                # Same memoized walk the library load uses for its cache check
+                entries = self._get_lib_parser(libs_path)._scan_libs()
+                for path, mtime in sorted((str(e.path), e.mtime) for e in entries):
+                    digest.update(f"\0{path}\0{mtime!r}".encode())
+        return f"{_BLOCK_FORMAT}:{digest.hexdigest()}"
+
     def extract(self, sv_file: str, match_protocols: bool = True,
                 expand_interfaces: bool = True) -> DiagramBlock:
         """Parse SV file and create DiagramBlock.
 
+        When ``block_cache`` is set, a block extracted earlier from unchanged
+        inputs with the same options is returned without re-parsing.
+
         Args:
             sv_file: Path to SystemVerilog file
             match_protocols: Whether to try matching bus protocols
@@ -111,31 +195,62 @@ class SVDiagramExtractor:
         Returns:
             DiagramBlock with extracted port information
         """
+        if self.block_cache is None:
+            return self._extract(sv_file, match_protocols, expand_interfaces)
+
+        # One row per file and option set; a changed fingerprint replaces it
+        key = f"{os.path.abspath(sv_file)}|{int(match_protocols)}|{int(expand_interfaces)}"
+        fingerprint = self._fingerprint(sv_file, match_protocols)
+
+        with closing(sqlite3.connect(self.block_cache)) as db, db:
+            db.execute("CREATE TABLE IF NOT EXISTS blocks "
+                       "(key TEXT PRIMARY KEY, fingerprint TEXT, block BLOB)")
+            row = db.execute("SELECT fingerprint, block FROM blocks WHERE key = ?",
+                             (key,)).fetchone()
+        if row is not None and row[0] == fingerprint:
+            return pickle.loads(row[1])
+
+        block = self._extract(sv_file, match_protocols, expand_interfaces)
+
+        with closing(sqlite3.connect(self.block_cache)) as db, db:
+            db.execute("INSERT OR REPLACE INTO blocks VALUES (?, ?, ?)",
+                       (key, fingerprint, pickle.dumps(block, pickle.HIGHEST_PROTOCOL)))
+        return block
+
+    def _extract(self, sv_file: str, match_protocols: bool,
+                 expand_interfaces: bool) -> DiagramBlock:
+        """Parse SV file and build the DiagramBlock (uncached)."""
         # Parse SystemVerilog file
         parser = SystemVerilogParser()
-        module = parser.parse_file(sv_file)
+
+        if match_protocols and self.matcher is None:
+            # The protocol library does not depend on the SV file, so load
+            # it in the background while the file is parsed
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                library_load = executor.submit(self._load_library)
+                module = parser.parse_file(sv_file)
+                library_load.result()
+        else:
+            module = parser.parse_file(sv_file)
 
         if module is None:
             raise ValueError(f"Failed to parse SystemVerilog file: {sv_file}")
 
         diagram_ports: List[DiagramPort] = []
 
-        if match_protocols and self.matcher is None:
-            self._load_library()
-
         if match_protocols and self.matcher is not None:
             # Group ports by prefix and try to match protocols
             port_groups = parser.group_ports_by_prefix()
 
-            # Track which ports have been added to interfaces
-            interface_port_names = set()
-
             # Match each group to protocols
             bus_interfaces, unmatched = self.matcher.match_all_groups(port_groups)
 
             # Create a map of physical port names to PortDefinition for quick lookup
             port_map = {port.name: port for port in module.ports}
 
+            # Ports not yet added via an interface (insertion keeps module order)
+            remaining = dict(port_map)
+
             # Add matched bus interfaces
             for bus_if in bus_interfaces:
                 # Skip reset interfaces - they should be treated as signals
@@ -147,16 +262,12 @@ class SVDiagramExtractor:
                     # Expand interface into individual signals
                     # Keep original port direction (don't override with interface mode)
                     # Add each port in the interface as individual signal
-                    for logical_name, physical_name in bus_if.port_maps.items():
-                        if physical_name in port_map:
-                            port = port_map[physical_name]
-                            diagram_port = self._port_to_diagram_port(port)
-                            # Keep original direction from port definition
-                            # Force reset signals to be SIGNAL type
-                            if diagram_port.is_reset:
-                                diagram_port.port_type = PortType.SIGNAL
-                            diagram_ports.append(diagram_port)
-                            interface_port_names.add(physical_name)
+                    physical_names = [name for name in bus_if.port_maps.values()
+                                      if name in port_map]
+                    diagram_ports.extend([self._signal_port(port_map[name])
+                                          for name in physical_names])
+                    for name in physical_names:
+                        remaining.pop(name, None)
                 else:
                     # Add as interface (original behavior)
                     # Determine direction based on interface mode
@@ -174,20 +285,14 @@ class SVDiagramExtractor:
                     ))
 
                     # Track ports in this interface
-                    interface_port_names.update(bus_if.port_maps.values())
+                    for physical_name in bus_if.port_maps.values():
+                        remaining.pop(physical_name, None)
 
             # Add unmatched ports
-            for port in module.ports:
-                if port.name not in interface_port_names:
-                    diagram_port = self._port_to_diagram_port(port)
-                    # Force reset signals to be SIGNAL type, not INTERFACE
-                    if diagram_port.is_reset:
-                        diagram_port.port_type = PortType.SIGNAL
-                    diagram_ports.append(diagram_port)
+            diagram_ports.extend([self._signal_port(port) for port in remaining.values()])
         else:
             # No protocol matching, just convert all ports
-            for port in module.ports:
-                diagram_ports.append(self._port_to_diagram_port(port))
+            diagram_ports = [self._port_to_diagram_port(port) for port in module.ports]
 
         return DiagramBlock(
             name=module.name,
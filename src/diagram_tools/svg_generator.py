@@ -1,17 +1,127 @@
 """Generate SVG diagrams from DiagramBlock."""
 
-from xml.etree import ElementTree as ET
-from xml.dom import minidom
-from typing import List
+import io
+import re
+from functools import lru_cache
+from typing import Dict, List, TextIO
+from xml.sax.saxutils import escape
 
 from .diagram_model import DiagramBlock, DiagramPort, DiagramConfig, PortType, PortDirection
 
 
+# Characters that must be escaped in SVG text content
+_NEEDS_ESCAPE = re.compile(r'[&<>]')
+
+
+@lru_cache(maxsize=4096)
+def _escape_text(text: str) -> str:
+    """Escape text content; identifier-like names are returned unchanged."""
+    if _NEEDS_ESCAPE.search(text) is None:
+        return text
+    return escape(text)
+
+
+# Diagram stylesheet; ``c`` is the DiagramConfig
+_STYLE_TEMPLATE = """
+            .block {{
+                fill: {c.block_fill_color};
+                stroke: {c.block_stroke_color};
+                stroke-width: 2;
+            }}
+            .block-title {{
+                font-family: {c.font_family};
+                font-size: {c.title_font_size}px;
+                font-weight: bold;
+                text-anchor: middle;
+                dominant-baseline: middle;
+            }}
+            .port-label {{
+                font-family: {c.font_family};
+                font-size: {c.font_size}px;
+                dominant-baseline: middle;
+            }}
+            .port-label-left {{
+                text-anchor: end;
+            }}
+            .port-label-right {{
+                text-anchor: start;
+            }}
+            .port-line {{
+                stroke: {c.port_stroke_color};
+                fill: none;
+            }}
+            .signal-line {{
+                stroke-width: {c.signal_line_width}px;
+            }}
+            .bus-line {{
+                stroke-width: {c.bus_line_width}px;
+            }}
+            .interface-line {{
+                stroke-width: {c.interface_line_width}px;
+            }}
+            .arrow-marker {{
+                fill: {c.port_stroke_color};
+            }}
+        """
+
+
 class SVGGenerator:
     """Generate SVG diagram from DiagramBlock."""
 
     SVG_NS = "http://www.w3.org/2000/svg"
 
+    # Arrow marker definitions (identical for every diagram)
+    _ARROW_MARKERS = (
+        '  <defs>\n'
+        # Arrow pointing right (for input and output)
+        '    <marker id="arrow-right" markerWidth="10" markerHeight="10" refX="9" refY="3" '
+        'orient="auto" markerUnits="strokeWidth">\n'
+        '      <path d="M0,0 L0,6 L9,3 z" class="arrow-marker"/>\n'
+        '    </marker>\n'
+        # Arrow pointing left (for inout bidirectional)
+        '    <marker id="arrow-left" markerWidth="10" markerHeight="10" refX="1" refY="3" '
+        'orient="auto" markerUnits="strokeWidth">\n'
+        '      <path d="M9,0 L9,6 L0,3 z" class="arrow-marker"/>\n'
+        '    </marker>\n'
+        # Small arrow for bidirectional (left side)
+        '    <marker id="arrow-bidir-left" markerWidth="6" markerHeight="6" refX="1" refY="3" '
+        'orient="auto" markerUnits="strokeWidth">\n'
+        '      <path d="M5,0 L5,6 L0,3 z" class="arrow-marker"/>\n'
+        '    </marker>\n'
+        # Small arrow for bidirectional (right side)
+        '    <marker id="arrow-bidir-right" markerWidth="6" markerHeight="6" refX="5" refY="3" '
+        'orient="auto" markerUnits="strokeWidth">\n'
+        '      <path d="M0,0 L0,6 L5,3 z" class="arrow-marker"/>\n'
+        '    </marker>\n'
+        '  </defs>\n'
+    )
+
+    # Per-port fragments; numeric fields need no escaping
+    _PORT_LINE_TEMPLATE = (
+        '  <line class="{cls}" x1="{x1}" y1="{y}" x2="{x2}" y2="{y}"{markers}/>\n'
+    )
+    _PORT_LABEL_TEMPLATE = (
+        '  <text class="port-label port-label-{side}" x="{x}" y="{y}">{text}</text>\n'
+    )
+    # CSS class for each port line type
+    _LINE_CLASSES = {
+        PortType.INTERFACE: "port-line interface-line",
+        PortType.BUS: "port-line bus-line",
+        PortType.SIGNAL: "port-line signal-line",
+    }
+
+    _MARKERS_INPUT = ' marker-end="url(#arrow-right)"'
+    _MARKERS_OUTPUT = ' marker-end="url(#arrow-right)"'
+    _MARKERS_INOUT = (' marker-start="url(#arrow-bidir-left)"'
+                      ' marker-end="url(#arrow-bidir-right)"')
+
+    # Left-side markers: inputs point into the block, inouts get small
+    # arrows on both ends
+    _LEFT_MARKERS = {
+        PortDirection.INPUT: _MARKERS_INPUT,
+        PortDirection.INOUT: _MARKERS_INOUT,
+    }
+
     def __init__(self, config: DiagramConfig = None):
         """Initialize generator with configuration.
 
@@ -20,6 +130,14 @@ class SVGGenerator:
         """
         self.config = config or DiagramConfig()
 
+        # Approximate: each character is about 0.6 * font_size wide
+        self._char_width = self.config.font_size * 0.6
+        self._text_widths: Dict[str, float] = {}
+
+        # The stylesheet depends only on the config; render it once
+        css = _STYLE_TEMPLATE.format(c=self.config)
+        self._style_element = f'  <style>{escape(css)}</style>\n'
+
     def _estimate_text_width(self, text: str) -> float:
         """Estimate text width in pixels based on font size and character count.
 
@@ -29,36 +147,44 @@ class SVGGenerator:
         Returns:
             Estimated width in pixels
         """
-        # Approximate: each character is about 0.6 * font_size wide
-        # Add some padding for safety
-        char_width = self.config.font_size * 0.6
-        return len(text) * char_width + 10
-
-    def _calculate_dimensions(self, block: DiagramBlock) -> tuple:
+        width = self._text_widths.get(text)
+        if width is None:
+            # Add some padding for safety
+            width = len(text) * self._char_width + 10
+            self._text_widths[text] = width
+        return width
+
+    def _calculate_dimensions(self, block: DiagramBlock,
+                              left_ports: List[DiagramPort],
+                              right_ports: List[DiagramPort]) -> tuple:
         """Calculate block dimensions based on port count and label lengths.
 
+        Args:
+            block: DiagramBlock being rendered
+            left_ports: Sorted ports for the left side
+            right_ports: Sorted ports for the right side
+
         Returns:
             Tuple of (block_width, block_height, total_width, total_height)
         """
-        left_count = len(block.left_ports)
-        right_count = len(block.right_ports)
-        max_ports = max(left_count, right_count, 1)
+        max_ports = max(len(left_ports), len(right_ports), 1)
 
         block_height = (self.config.block_padding * 2 +
                         max_ports * self.config.port_spacing + 30)  # +30 for title
 
         block_width = self.config.block_min_width
 
-        # Calculate required margins based on longest labels
+        # Calculate required margins based on longest labels.
+        # Width is linear in label length, so only the longest label matters.
         max_left_label_width = 0
-        for port in block.left_ports:
-            label_width = self._estimate_text_width(port.display_name)
-            max_left_label_width = max(max_left_label_width, label_width)
+        if left_ports:
+            longest = max((p.display_name for p in left_ports), key=len)
+            max_left_label_width = self._estimate_text_width(longest)
 
         max_right_label_width = 0
-        for port in block.right_ports:
-            label_width = self._estimate_text_width(port.display_name)
-            max_right_label_width = max(max_right_label_width, label_width)
+        if right_ports:
+            longest = max((p.display_name for p in right_ports), key=len)
+            max_right_label_width = self._estimate_text_width(longest)
 
         # Add port_stub_length and some padding
         margin_left = max(self.config.margin_left,
@@ -81,9 +207,36 @@ class SVGGenerator:
         Returns:
             SVG XML as string
         """
+        buf = io.StringIO()
+        self._write(buf, block)
+        return buf.getvalue()
+
+    def write_to_file(self, block: DiagramBlock, output_path: str):
+        """Write SVG to file.
+
+        Args:
+            block: DiagramBlock to render
+            output_path: Output file path
+        """
+        # Fragments are small; a large buffer coalesces them into few writes
+        with open(output_path, 'w', encoding='utf-8', buffering=65536) as f:
+            # Add XML declaration
+            f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+            self._write(f, block)
+
+    def _write(self, out: TextIO, block: DiagramBlock):
+        """Render the diagram as indented SVG text into ``out``.
+
+        The document shape is fixed, so fragments are written directly
+        instead of building and pretty-printing an element tree.
+        """
+        # Read the sorted port lists once for sizing and drawing
+        left_ports = block.left_ports
+        right_ports = block.right_ports
+
         # Calculate dimensions
         block_width, block_height, total_width, total_height, margin_left, margin_right = \
-            self._calculate_dimensions(block)
+            self._calculate_dimensions(block, left_ports, right_ports)
 
         # Update block dimensions
         block.width = block_width
@@ -91,256 +244,115 @@ class SVGGenerator:
         block.x = margin_left
         block.y = self.config.margin_top
 
-        # Create SVG root with namespace
-        ET.register_namespace('', self.SVG_NS)
-        svg = ET.Element("svg", {
-            "xmlns": self.SVG_NS,
-            "width": str(total_width),
-            "height": str(total_height),
-            "viewBox": f"0 0 {total_width} {total_height}",
-        })
+        # SVG root with namespace
+        out.write(
+            f'<svg xmlns="{self.SVG_NS}" width="{total_width}" height="{total_height}" '
+            f'viewBox="0 0 {total_width} {total_height}">\n'
+        )
 
         # Add styles
-        self._add_styles(svg)
+        self._add_styles(out)
 
         # Add arrow markers
-        self._add_arrow_markers(svg)
+        self._add_arrow_markers(out)
 
         # Add main block
-        self._add_block(svg, block)
+        self._add_block(out, block)
 
         # Add ports
-        self._add_left_ports(svg, block)
-        self._add_right_ports(svg, block)
-
-        # Generate XML string with formatting
-        xml_string = ET.tostring(svg, encoding='unicode', method='xml')
-        # Format the XML for better readability
-        dom = minidom.parseString(xml_string)
-        formatted = dom.toprettyxml(indent='  ')
-        # Remove extra blank lines and XML declaration (will be added in write_to_file)
-        lines = [line for line in formatted.split('\n')
-                 if line.strip() and not line.strip().startswith('<?xml')]
-        return '\n'.join(lines)
+        self._add_left_ports(out, block, left_ports)
+        self._add_right_ports(out, block, right_ports)
 
-    def write_to_file(self, block: DiagramBlock, output_path: str):
-        """Write SVG to file.
-
-        Args:
-            block: DiagramBlock to render
-            output_path: Output file path
-        """
-        svg_content = self.generate(block)
-        # Add XML declaration
-        full_content = '<?xml version="1.0" encoding="UTF-8"?>\n' + svg_content
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(full_content)
+        out.write('</svg>')
 
-    def _add_styles(self, svg: ET.Element):
+    def _add_styles(self, out: TextIO):
         """Add CSS styles for the diagram."""
-        style = ET.SubElement(svg, "style")
-        style.text = f"""
-            .block {{
-                fill: {self.config.block_fill_color};
-                stroke: {self.config.block_stroke_color};
-                stroke-width: 2;
-            }}
-            .block-title {{
-                font-family: {self.config.font_family};
-                font-size: {self.config.title_font_size}px;
-                font-weight: bold;
-                text-anchor: middle;
-                dominant-baseline: middle;
-            }}
-            .port-label {{
-                font-family: {self.config.font_family};
-                font-size: {self.config.font_size}px;
-                dominant-baseline: middle;
-            }}
-            .port-label-left {{
-                text-anchor: end;
-            }}
-            .port-label-right {{
-                text-anchor: start;
-            }}
-            .port-line {{
-                stroke: {self.config.port_stroke_color};
-                fill: none;
-            }}
-            .signal-line {{
-                stroke-width: {self.config.signal_line_width}px;
-            }}
-            .bus-line {{
-                stroke-width: {self.config.bus_line_width}px;
-            }}
-            .interface-line {{
-                stroke-width: {self.config.interface_line_width}px;
-            }}
-            .arrow-marker {{
-                fill: {self.config.port_stroke_color};
-            }}
-        """
+        out.write(self._style_element)
 
-    def _add_arrow_markers(self, svg: ET.Element):
+    def _add_arrow_markers(self, out: TextIO):
         """Add arrow marker definitions for input/output/inout."""
-        defs = ET.SubElement(svg, "defs")
+        out.write(self._ARROW_MARKERS)
 
-        # Arrow pointing right (for input and output)
-        marker_right = ET.SubElement(defs, "marker", {
-            "id": "arrow-right",
-            "markerWidth": "10",
-            "markerHeight": "10",
-            "refX": "9",
-            "refY": "3",
-            "orient": "auto",
-            "markerUnits": "strokeWidth"
-        })
-        path_right = ET.SubElement(marker_right, "path", {
-            "d": "M0,0 L0,6 L9,3 z",
-            "class": "arrow-marker"
-        })
-
-        # Arrow pointing left (for inout bidirectional)
-        marker_left = ET.SubElement(defs, "marker", {
-            "id": "arrow-left",
-            "markerWidth": "10",
-            "markerHeight": "10",
-            "refX": "1",
-            "refY": "3",
-            "orient": "auto",
-            "markerUnits": "strokeWidth"
-        })
-        path_left = ET.SubElement(marker_left, "path", {
-            "d": "M9,0 L9,6 L0,3 z",
-            "class": "arrow-marker"
-        })
-
-        # Small arrow for bidirectional (left side)
-        marker_bidir_left = ET.SubElement(defs, "marker", {
-            "id": "arrow-bidir-left",
-            "markerWidth": "6",
-            "markerHeight": "6",
-            "refX": "1",
-            "refY": "3",
-            "orient": "auto",
-            "markerUnits": "strokeWidth"
-        })
-        path_bidir_left = ET.SubElement(marker_bidir_left, "path", {
-            "d": "M5,0 L5,6 L0,3 z",
-            "class": "arrow-marker"
-        })
-
-        # Small arrow for bidirectional (right side)
-        marker_bidir_right = ET.SubElement(defs, "marker", {
-            "id": "arrow-bidir-right",
-            "markerWidth": "6",
-            "markerHeight": "6",
-            "refX": "5",
-            "refY": "3",
-            "orient": "auto",
-            "markerUnits": "strokeWidth"
-        })
-        path_bidir_right = ET.SubElement(marker_bidir_right, "path", {
-            "d": "M0,0 L0,6 L5,3 z",
-            "class": "arrow-marker"
-        })
-
-    def _add_block(self, svg: ET.Element, block: DiagramBlock):
+    def _add_block(self, out: TextIO, block: DiagramBlock):
         """Add the main block rectangle with title."""
         # Rectangle
-        ET.SubElement(svg, "rect", {
-            "class": "block",
-            "x": str(block.x),
-            "y": str(block.y),
-            "width": str(block.width),
-            "height": str(block.height),
-            "rx": "5",
-        })
+        out.write(
+            f'  <rect class="block" x="{block.x}" y="{block.y}" '
+            f'width="{block.width}" height="{block.height}" rx="5"/>\n'
+        )
 
         # Title
-        title = ET.SubElement(svg, "text", {
-            "class": "block-title",
-            "x": str(block.x + block.width / 2),
-            "y": str(block.y + 20),
-        })
-        title.text = block.name
+        out.write(
+            f'  <text class="block-title" x="{block.x + block.width / 2}" '
+            f'y="{block.y + 20}">{_escape_text(block.name)}</text>\n'
+        )
 
     def _get_line_class(self, port: DiagramPort) -> str:
         """Get CSS class for port line based on type."""
-        if port.port_type == PortType.INTERFACE:
-            return "port-line interface-line"
-        elif port.port_type == PortType.BUS:
-            return "port-line bus-line"
-        else:
-            return "port-line signal-line"
-
-    def _add_left_ports(self, svg: ET.Element, block: DiagramBlock):
+        return self._LINE_CLASSES[port.port_type]
+
+    def _add_left_ports(self, out: TextIO, block: DiagramBlock,
+                        ports: List[DiagramPort]):
         """Add input and inout ports on the left side."""
-        ports = block.left_ports
         start_y = block.y + self.config.block_padding + 30  # After title
+        spacing = self.config.port_spacing
 
-        for i, port in enumerate(ports):
-            y = start_y + i * self.config.port_spacing
+        # Port stub line (same x span for every port on this side), formatted
+        # once and shared by every port
+        x1 = block.x - self.config.port_stub_length
+        x1_str = str(x1)
+        x2_str = str(block.x)
+        label_x = str(x1 - 5)
 
-            # Port stub line
-            x1 = block.x - self.config.port_stub_length
-            x2 = block.x
+        write = out.write
+        line_fmt = self._PORT_LINE_TEMPLATE.format
+        label_fmt = self._PORT_LABEL_TEMPLATE.format
+        line_classes = self._LINE_CLASSES
+        left_markers = self._LEFT_MARKERS
+
+        for i, port in enumerate(ports):
+            # Formatted once for both the line and the label
+            y = str(start_y + i * spacing)
 
             # Determine arrow markers based on direction
-            line_attrs = {
-                "class": self._get_line_class(port),
-                "x1": str(x1),
-                "y1": str(y),
-                "x2": str(x2),
-                "y2": str(y),
-            }
-
-            if port.direction == PortDirection.INPUT:
-                # Input: arrow pointing right (into block)
-                line_attrs["marker-end"] = "url(#arrow-right)"
-            elif port.direction == PortDirection.INOUT:
-                # Inout: small arrows on both ends
-                line_attrs["marker-start"] = "url(#arrow-bidir-left)"
-                line_attrs["marker-end"] = "url(#arrow-bidir-right)"
-
-            ET.SubElement(svg, "line", line_attrs)
+            markers = left_markers.get(port.direction, '')
+
+            write(line_fmt(cls=line_classes[port.port_type], x1=x1_str, x2=x2_str, y=y,
+                           markers=markers))
 
             # Port label
-            label = ET.SubElement(svg, "text", {
-                "class": "port-label port-label-left",
-                "x": str(x1 - 5),
-                "y": str(y),
-            })
-            label.text = port.display_name
-
-    def _add_right_ports(self, svg: ET.Element, block: DiagramBlock):
+            write(label_fmt(side='left', x=label_x, y=y,
+                            text=_escape_text(port.display_name)))
+
+    def _add_right_ports(self, out: TextIO, block: DiagramBlock,
+                         ports: List[DiagramPort]):
         """Add output ports on the right side."""
-        ports = block.right_ports
         start_y = block.y + self.config.block_padding + 30  # After title
+        spacing = self.config.port_spacing
 
-        for i, port in enumerate(ports):
-            y = start_y + i * self.config.port_spacing
+        # Port stub line (same x span for every port on this side), formatted
+        # once and shared by every port
+        x1 = block.x + block.width
+        x2 = x1 + self.config.port_stub_length
+        x1_str = str(x1)
+        x2_str = str(x2)
+        label_x = str(x2 + 5)
+
+        # Output: arrow pointing right (out of block)
+        markers = self._MARKERS_OUTPUT
 
-            # Port stub line
-            x1 = block.x + block.width
-            x2 = x1 + self.config.port_stub_length
+        write = out.write
+        line_fmt = self._PORT_LINE_TEMPLATE.format
+        label_fmt = self._PORT_LABEL_TEMPLATE.format
+        line_classes = self._LINE_CLASSES
 
-            # Output: arrow pointing right (out of block)
-            line_attrs = {
-                "class": self._get_line_class(port),
-                "x1": str(x1),
-                "y1": str(y),
-                "x2": str(x2),
-                "y2": str(y),
-                "marker-end": "url(#arrow-right)",
-            }
+        for i, port in enumerate(ports):
+            # Formatted once for both the line and the label
+            y = str(start_y + i * spacing)
 
-            ET.SubElement(svg, "line", line_attrs)
+            write(line_fmt(cls=line_classes[port.port_type], x1=x1_str, x2=x2_str, y=y,
+                           markers=markers))
 
             # Port label
-            label = ET.SubElement(svg, "text", {
-                "class": "port-label port-label-right",
-                "x": str(x2 + 5),
-                "y": str(y),
-            })
-            label.text = port.display_name
+            write(label_fmt(side='right', x=label_x, y=y,
+                            text=_escape_text(port.display_name)))
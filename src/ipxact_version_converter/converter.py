@@ -1,5 +1,10 @@
+import os
+
 from lxml import etree
 
+from sv_to_ipxact.validator import load_schema
+
+
 class IpxactConverter:
     def __init__(self, input_file):
         self.input_file = input_file
@@ -49,50 +54,58 @@ class IpxactConverter:
         if not target_namespace:
             raise ValueError(f"Unknown target version: {target_version}")
 
-        # Update the namespace prefixes
-        new_nsmap = {k: v.replace(self.namespace, target_namespace) for k, v in self.root.nsmap.items()}
-
-        # Create a new root element with the correct namespace
-        new_root = etree.Element(self.root.tag.replace(self.namespace, target_namespace), nsmap=new_nsmap)
+        # Clark-notation prefixes, built once for the whole walk
+        old_brace = f"{{{self.namespace}}}"
+        new_brace = f"{{{target_namespace}}}"
+        old_len = len(old_brace)
+
+        def rename(name):
+            if name.startswith(old_brace):
+                return new_brace + name[old_len:]
+            return name
+
+        # lxml cannot rebind a prefix on an existing element, so the root is
+        # recreated with the same prefixes pointing at the target URI. Tags
+        # renamed below it then pick up those prefixes instead of nsN ones.
+        new_nsmap = {
+            prefix: (target_namespace if uri == self.namespace else uri)
+            for prefix, uri in self.root.nsmap.items()
+        }
+        new_root = etree.Element(rename(self.root.tag), nsmap=new_nsmap)
+        for name, value in self.root.attrib.items():
+            new_root.set(rename(name), value)
+        new_root.text = self.root.text
         new_root[:] = self.root[:]
-        for attr, value in self.root.attrib.items():
-            new_root.set(attr, value)
+
+        # iter(etree.Element) walks elements only (no comments/PIs) in C,
+        # without materializing a list like xpath('//*') does
+        for element in new_root.iter(etree.Element):
+            element.tag = rename(element.tag)
+            attrib = element.attrib
+            if any(name.startswith(old_brace) for name in attrib.keys()):
+                renamed = {rename(name): value for name, value in attrib.items()}
+                attrib.clear()
+                attrib.update(renamed)
+
+        # Drop the now-unused declarations of the source namespace that
+        # moved children still carry
+        etree.cleanup_namespaces(new_root, top_nsmap=new_nsmap)
+
+        # Keep comments and processing instructions around the root
+        for sibling in reversed(list(self.root.itersiblings(preceding=True))):
+            new_root.addprevious(sibling)
+        for sibling in reversed(list(self.root.itersiblings())):
+            new_root.addnext(sibling)
 
         self.root = new_root
         self.tree = etree.ElementTree(new_root)
 
-        # Determine the old and new prefixes
-        old_prefix = None
-        new_prefix = None
-        for prefix, uri in new_nsmap.items():
-            if uri == target_namespace:
-                new_prefix = prefix
-            if self.root.nsmap.get(prefix) == self.namespace:
-                old_prefix = prefix
-
-        if old_prefix and new_prefix and old_prefix != new_prefix:
-            # Update all elements in the tree
-            for element in self.root.xpath('//*'):
-                if isinstance(element.tag, str) and element.tag.startswith(f"{{{self.namespace}}}"):
-                    element.tag = element.tag.replace(f"{{{self.namespace}}}", f"{{{target_namespace}}}")
-
-                for attr_name in list(element.attrib.keys()):
-                    if attr_name.startswith(f"{{{self.namespace}}}"):
-                        new_attr_name = attr_name.replace(f"{{{self.namespace}}}", f"{{{target_namespace}}}")
-                        element.attrib[new_attr_name] = element.attrib.pop(attr_name)
-        else: # if no prefix or prefix is the same, just update namespace
-             for element in self.root.xpath('//*'):
-                if isinstance(element.tag, str) and self.namespace in element.tag:
-                    element.tag = element.tag.replace(self.namespace, target_namespace)
-
-
         self.namespace = target_namespace
 
     def validate(self, version):
         schema_path = f"libs/ipxact_schemas/{version}/component.xsd"
         try:
-            xmlschema_doc = etree.parse(schema_path)
-            xmlschema = etree.XMLSchema(xmlschema_doc)
+            xmlschema = load_schema(os.path.abspath(schema_path))
             xmlschema.assertValid(self.tree)
             print("Validation successful!")
             return True
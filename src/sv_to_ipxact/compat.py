@@ -0,0 +1,7 @@
+"""Helpers for differences between supported Python versions."""
+
+import sys
+
+# ``@dataclass(**DATACLASS_SLOTS)`` stores fields in __slots__ where
+# supported (Python 3.10+) and falls back to a plain dataclass before that.
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
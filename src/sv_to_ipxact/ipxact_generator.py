@@ -1,8 +1,11 @@
 """IP-XACT XML generator."""
 
+import gzip
 import os
 import subprocess
-from typing import List
+from typing import Dict, List, Tuple
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from lxml import etree
 from datetime import datetime
 import urllib.request
@@ -10,10 +13,46 @@ from pathlib import Path
 
 from .sv_parser import ModuleDefinition, PortDefinition
 from .protocol_matcher import BusInterface
+from .validator import load_schema
+
+
+# Local names of every element (and 2009 attribute) the generator emits
+_TAG_NAMES = (
+    'abstractionRef', 'abstractionType', 'abstractionTypes', 'addressBlock',
+    'addressSpace', 'addressSpaceRef', 'addressSpaces', 'baseAddress',
+    'busInterface', 'busInterfaces', 'busType', 'component', 'dataType',
+    'direction', 'envIdentifier', 'file', 'fileSet', 'fileSets', 'fileType',
+    'initiator', 'language', 'left', 'library', 'logicalPort', 'master',
+    'memoryMap', 'memoryMapRef', 'memoryMaps', 'model', 'modelParameter',
+    'modelParameters', 'name', 'parameter', 'parameters', 'physicalPort',
+    'port', 'portMap', 'portMaps', 'ports', 'range', 'right', 'slave',
+    'target', 'typeName', 'usage', 'value', 'vector', 'vectors', 'vendor',
+    'version', 'view', 'views', 'width', 'wire', 'wireTypeDef', 'wireTypeDefs',
+)
+
+# SystemVerilog port direction -> IP-XACT wire direction
+_DIRECTION_MAP = {
+    'input': 'in',
+    'output': 'out',
+    'inout': 'inout',
+    'interface': 'inout',  # Map interface ports to inout by default
+}
+
+
+@lru_cache(maxsize=None)
+def _clark_tags(namespace: str) -> Dict[str, str]:
+    """Map local tag names to Clark notation (``{uri}local``) for a namespace."""
+    return {local: f"{{{namespace}}}{local}" for local in _TAG_NAMES}
 
 
 class IPXACTGenerator:
-    """Generate IP-XACT component XML from parsed module and matched interfaces."""
+    """Generate IP-XACT component XML from parsed module and matched interfaces.
+
+    Every child element is created with ``etree.SubElement`` directly on its
+    final parent. Building detached subtrees and ``append``-ing them makes
+    lxml move each node into the target document, which gets expensive for
+    components with many ports, so keep new builders on ``SubElement`` too.
+    """
 
     NAMESPACES_2009 = {
         'spirit': 'http://www.spiritconsortium.org/XMLSchema/SPIRIT/1685-2009',
@@ -77,17 +116,23 @@ class IPXACTGenerator:
             self.namespaces = self.NAMESPACES_2014
             self.schema_location = self.SCHEMA_LOCATION_2014
 
+        self._tags = _clark_tags(self.namespaces[self.ns_prefix])
+
+        # Version-specific bus interface body, chosen once per generator
+        self._add_bus_refs = {
+            '2009': self._add_bus_refs_2009,
+            '2022': self._add_bus_refs_2022,
+        }.get(self.version, self._add_bus_refs_2014)
+
     def generate(self) -> etree.Element:
         """Generate complete IP-XACT component XML."""
-        # Register namespaces
-        for prefix, uri in self.namespaces.items():
-            etree.register_namespace(prefix, uri)
-
+        # The root nsmap binds the prefixes for every Clark-notation tag below,
+        # so nothing needs to go into lxml's global namespace registry
         nsmap = self.namespaces
 
         # Create root element
         root = etree.Element(
-            f"{{{self.namespaces[self.ns_prefix]}}}component",
+            self._tags['component'],
             nsmap=nsmap
         )
 
@@ -125,23 +170,23 @@ class IPXACTGenerator:
 
     def _add_vlnv(self, parent: etree.Element):
         """Add vendor/library/name/version identification."""
-        ns = self.namespaces[self.ns_prefix]
+        t = self._tags
 
-        vendor = etree.SubElement(parent, f"{{{ns}}}vendor")
+        vendor = etree.SubElement(parent, t['vendor'])
         vendor.text = "user"
 
-        library = etree.SubElement(parent, f"{{{ns}}}library")
+        library = etree.SubElement(parent, t['library'])
         library.text = "user"
 
-        name = etree.SubElement(parent, f"{{{ns}}}name")
+        name = etree.SubElement(parent, t['name'])
         name.text = self.module.name
 
-        version = etree.SubElement(parent, f"{{{ns}}}version")
+        version = etree.SubElement(parent, t['version'])
         version.text = "1.0"
 
     def _add_address_spaces(self, parent: etree.Element):
         """Add addressSpaces section for master interfaces."""
-        ns = self.namespaces[self.ns_prefix]
+        t = self._tags
 
         # Find master interfaces that are addressable
         masters = [bi for bi in self.bus_interfaces
@@ -150,23 +195,23 @@ class IPXACTGenerator:
         if not masters:
             return
 
-        addr_spaces = etree.SubElement(parent, f"{{{ns}}}addressSpaces")
+        addr_spaces = etree.SubElement(parent, t['addressSpaces'])
 
         for master in masters:
-            space = etree.SubElement(addr_spaces, f"{{{ns}}}addressSpace")
+            space = etree.SubElement(addr_spaces, t['addressSpace'])
 
-            name = etree.SubElement(space, f"{{{ns}}}name")
+            name = etree.SubElement(space, t['name'])
             name.text = f"AS_{master.name}"
 
-            range_elem = etree.SubElement(space, f"{{{ns}}}range")
+            range_elem = etree.SubElement(space, t['range'])
             range_elem.text = "4294967296"  # Default 4GB
 
-            width = etree.SubElement(space, f"{{{ns}}}width")
+            width = etree.SubElement(space, t['width'])
             width.text = "32"  # Default 32-bit
 
     def _add_memory_maps(self, parent: etree.Element):
         """Add memoryMaps section for slave interfaces."""
-        ns = self.namespaces[self.ns_prefix]
+        t = self._tags
 
         # Find slave interfaces that are addressable
         slaves = [bi for bi in self.bus_interfaces
@@ -175,390 +220,342 @@ class IPXACTGenerator:
         if not slaves:
             return
 
-        mem_maps = etree.SubElement(parent, f"{{{ns}}}memoryMaps")
+        mem_maps = etree.SubElement(parent, t['memoryMaps'])
 
         for slave in slaves:
-            mem_map = etree.SubElement(mem_maps, f"{{{ns}}}memoryMap")
+            mem_map = etree.SubElement(mem_maps, t['memoryMap'])
 
-            name = etree.SubElement(mem_map, f"{{{ns}}}name")
+            name = etree.SubElement(mem_map, t['name'])
             name.text = f"MM_{slave.name}"
 
-            addr_block = etree.SubElement(mem_map, f"{{{ns}}}addressBlock")
+            addr_block = etree.SubElement(mem_map, t['addressBlock'])
 
-            blk_name = etree.SubElement(addr_block, f"{{{ns}}}name")
+            blk_name = etree.SubElement(addr_block, t['name'])
             blk_name.text = f"BLK_{slave.name}"
 
-            base_addr = etree.SubElement(addr_block, f"{{{ns}}}baseAddress")
+            base_addr = etree.SubElement(addr_block, t['baseAddress'])
             base_addr.text = "0"
 
-            range_elem = etree.SubElement(addr_block, f"{{{ns}}}range")
+            range_elem = etree.SubElement(addr_block, t['range'])
             range_elem.text = "4096"  # Default 4KB
 
-            width = etree.SubElement(addr_block, f"{{{ns}}}width")
+            width = etree.SubElement(addr_block, t['width'])
             width.text = "32"  # Default 32-bit
 
-            usage = etree.SubElement(addr_block, f"{{{ns}}}usage")
+            usage = etree.SubElement(addr_block, t['usage'])
             usage.text = "register"
 
     def _add_file_sets(self, parent: etree.Element):
         """Add fileSets section."""
-        ns = self.namespaces[self.ns_prefix]
+        t = self._tags
 
-        file_sets = etree.SubElement(parent, f"{{{ns}}}fileSets")
-        file_set = etree.SubElement(file_sets, f"{{{ns}}}fileSet")
+        file_sets = etree.SubElement(parent, t['fileSets'])
+        file_set = etree.SubElement(file_sets, t['fileSet'])
 
-        name = etree.SubElement(file_set, f"{{{ns}}}name")
+        name = etree.SubElement(file_set, t['name'])
         name.text = "fs-sv"
 
-        file_elem = etree.SubElement(file_set, f"{{{ns}}}file")
+        file_elem = etree.SubElement(file_set, t['file'])
 
-        file_name = etree.SubElement(file_elem, f"{{{ns}}}name")
+        file_name = etree.SubElement(file_elem, t['name'])
         file_name.text = self.file_path
 
-        file_type = etree.SubElement(file_elem, f"{{{ns}}}fileType")
+        file_type = etree.SubElement(file_elem, t['fileType'])
         file_type.text = "systemVerilogSource"
 
     def _add_bus_interfaces(self, parent: etree.Element):
         """Add busInterfaces section."""
-        ns = self.namespaces[self.ns_prefix]
+        t = self._tags
 
-        bus_interfaces_elem = etree.SubElement(parent, f"{{{ns}}}busInterfaces")
+        bus_interfaces_elem = etree.SubElement(parent, t['busInterfaces'])
 
+        add_bus_interface = self._add_bus_interface
         for bus_if in self.bus_interfaces:
-            bus_interface_elem = etree.SubElement(bus_interfaces_elem, f"{{{ns}}}busInterface")
-
-            # Name
-            name = etree.SubElement(bus_interface_elem, f"{{{ns}}}name")
-            name.text = bus_if.name
-
-            if self.version == '2009':
-                # Bus type reference
-                bus_type = etree.SubElement(bus_interface_elem, f"{{{ns}}}busType")
-                bus_type.set(f"{{{ns}}}vendor", bus_if.protocol.vendor)
-                bus_type.set(f"{{{ns}}}library", bus_if.protocol.library)
-                bus_type.set(f"{{{ns}}}name", bus_if.protocol.name)
-                bus_type.set(f"{{{ns}}}version", bus_if.protocol.version)
-
-                # Abstraction type reference
-                abstraction_type = etree.SubElement(bus_interface_elem, f"{{{ns}}}abstractionType")
-                abstraction_type.set(f"{{{ns}}}vendor", bus_if.protocol.vendor)
-                abstraction_type.set(f"{{{ns}}}library", bus_if.protocol.library)
-                abstraction_type.set(f"{{{ns}}}name", f"{bus_if.protocol.name}_rtl")
-                abstraction_type.set(f"{{{ns}}}version", bus_if.protocol.version)
-
-                # Interface mode (master/slave)
-                mode_name = 'master' if bus_if.interface_mode == 'master' else 'slave'
-                mode_elem = etree.SubElement(bus_interface_elem, f"{{{ns}}}{mode_name}")
-
-                if bus_if.protocol.is_addressable:
-                    if bus_if.interface_mode == 'master':
-                        ref = etree.SubElement(mode_elem, f"{{{ns}}}addressSpaceRef")
-                        ref.set("addressSpaceRef", f"AS_{bus_if.name}")
-                    else:
-                        ref = etree.SubElement(mode_elem, f"{{{ns}}}memoryMapRef")
-                        ref.set("memoryMapRef", f"MM_{bus_if.name}")
-
-                # Port maps
-                port_maps = etree.SubElement(bus_interface_elem, f"{{{ns}}}portMaps")
-
-                for logical_name, physical_name in sorted(bus_if.port_maps.items()):
-                    port_map = etree.SubElement(port_maps, f"{{{ns}}}portMap")
-
-                    # Logical port
-                    logical_port = etree.SubElement(port_map, f"{{{ns}}}logicalPort")
-                    log_name = etree.SubElement(logical_port, f"{{{ns}}}name")
-                    log_name.text = logical_name
-
-                    # Physical port
-                    physical_port = etree.SubElement(port_map, f"{{{ns}}}physicalPort")
-                    phys_name = etree.SubElement(physical_port, f"{{{ns}}}name")
-                    phys_name.text = physical_name
-            elif self.version == '2022':
-                # Bus type reference
-                bus_type = etree.SubElement(bus_interface_elem, f"{{{ns}}}busType")
-                bus_type.set("vendor", bus_if.protocol.vendor)
-                bus_type.set("library", bus_if.protocol.library)
-                bus_type.set("name", bus_if.protocol.name)
-                bus_type.set("version", bus_if.protocol.version)
-
-                # Abstraction types
-                abstraction_types = etree.SubElement(bus_interface_elem, f"{{{ns}}}abstractionTypes")
-                abstraction_type = etree.SubElement(abstraction_types, f"{{{ns}}}abstractionType")
-
-                # Abstraction type reference
-                abstraction_ref = etree.SubElement(abstraction_type, f"{{{ns}}}abstractionRef")
-                abstraction_ref.set("vendor", bus_if.protocol.vendor)
-                abstraction_ref.set("library", bus_if.protocol.library)
-                abstraction_ref.set("name", f"{bus_if.protocol.name}_rtl")
-                abstraction_ref.set("version", bus_if.protocol.version)
-
-                # Interface mode (initiator/target)
-                mode_name = 'initiator' if bus_if.interface_mode == 'master' else 'target'
-                mode_elem = etree.SubElement(bus_interface_elem, f"{{{ns}}}{mode_name}")
-
-                if bus_if.protocol.is_addressable:
-                    if bus_if.interface_mode == 'master':
-                        ref = etree.SubElement(mode_elem, f"{{{ns}}}addressSpaceRef")
-                        ref.set("addressSpaceRef", f"AS_{bus_if.name}")
-                    else:
-                        ref = etree.SubElement(mode_elem, f"{{{ns}}}memoryMapRef")
-                        ref.set("memoryMapRef", f"MM_{bus_if.name}")
-
-                # Port maps
-                port_maps = etree.SubElement(abstraction_type, f"{{{ns}}}portMaps")
-
-                for logical_name, physical_name in sorted(bus_if.port_maps.items()):
-                    port_map = etree.SubElement(port_maps, f"{{{ns}}}portMap")
-
-                    # Logical port
-                    logical_port = etree.SubElement(port_map, f"{{{ns}}}logicalPort")
-                    log_name = etree.SubElement(logical_port, f"{{{ns}}}name")
-                    log_name.text = logical_name
-
-                    # Physical port
-                    physical_port = etree.SubElement(port_map, f"{{{ns}}}physicalPort")
-                    phys_name = etree.SubElement(physical_port, f"{{{ns}}}name")
-                    phys_name.text = physical_name
+            add_bus_interface(bus_interfaces_elem, bus_if)
+
+    def _add_bus_interface(self, parent: etree.Element, bus_if: BusInterface):
+        """Add a single busInterface element."""
+        t = self._tags
+
+        bus_interface_elem = etree.SubElement(parent, t['busInterface'])
+
+        # Name
+        name = etree.SubElement(bus_interface_elem, t['name'])
+        name.text = bus_if.name
+
+        # Bus/abstraction type references, interface mode and port maps
+        self._add_bus_refs(bus_interface_elem, bus_if)
+
+        # Clock/reset markers and bus parameters derived from SV parameters
+        params = self._bus_parameters(bus_if)
+        if params:
+            parameters = etree.SubElement(bus_interface_elem, t['parameters'])
+
+            for param_name, param_value in params:
+                param = etree.SubElement(parameters, t['parameter'])
+                name_elem = etree.SubElement(param, t['name'])
+                name_elem.text = param_name
+                value_elem = etree.SubElement(param, t['value'])
+                value_elem.text = param_value
+
+    def _bus_parameters(self, bus_if: BusInterface) -> List[Tuple[str, str]]:
+        """List (name, value) parameters for a bus interface, in output order."""
+        params = []
+
+        # Add parameters for Clock and Reset interfaces
+        # Heuristic: check if protocol name contains 'Clock' or 'Reset'
+        if 'Clock' in bus_if.protocol.name:
+            params.append(("isClock", "true"))
+
+        if 'Reset' in bus_if.protocol.name:
+            params.append(("isReset", "true"))
+
+            # For reset, we often want POLARITY. Defaulting to ACTIVE_LOW if n is in name
+            # This is a guess, but helpful.
+            polarity = "ACTIVE_LOW" if "_n" in bus_if.name.lower() else "ACTIVE_HIGH"
+            params.append(("POLARITY", polarity))
+
+        # Add bus parameters from SV parameters
+        # Heuristic: Look for parameters starting with interface name (case insensitive)
+        # e.g. M_AXI_ID_WIDTH -> ID_WIDTH for M_AXI interface
+        # Also handle C_ prefix (common in Xilinx IPs) e.g. C_M_AXI_ID_WIDTH
+
+        bus_params = {}
+        prefix = bus_if.name.upper() + "_"
+        c_prefix = "C_" + prefix
+
+        for param_name in self.module.parameters:
+            param_upper = param_name.upper()
+            suffix = None
+
+            # Check for direct prefix
+            if param_upper.startswith(prefix):
+                suffix = param_upper[len(prefix):]
+
+            # Check for C_ prefix
+            elif param_upper.startswith(c_prefix):
+                suffix = param_upper[len(c_prefix):]
+
+            if suffix:
+                # Filter out common suffixes that might not be bus parameters if needed
+                # For now, include everything
+                bus_params[suffix] = param_name
+
+        params.extend(sorted(bus_params.items()))
+        return params
+
+    def _add_bus_refs_2009(self, parent: etree.Element, bus_if: BusInterface):
+        """Add 2009 bus/abstraction type references, mode and port maps."""
+        t = self._tags
+        protocol = bus_if.protocol
+
+        # Bus type reference
+        etree.SubElement(parent, t['busType'], {
+            t['vendor']: protocol.vendor,
+            t['library']: protocol.library,
+            t['name']: protocol.name,
+            t['version']: protocol.version,
+        })
+
+        # Abstraction type reference
+        etree.SubElement(parent, t['abstractionType'], {
+            t['vendor']: protocol.vendor,
+            t['library']: protocol.library,
+            t['name']: f"{protocol.name}_rtl",
+            t['version']: protocol.version,
+        })
+
+        # Interface mode (master/slave)
+        self._add_interface_mode(parent, bus_if, 'master', 'slave')
+
+        # Port maps
+        self._add_port_maps(parent, bus_if.port_maps)
+
+    def _add_bus_refs_2014(self, parent: etree.Element, bus_if: BusInterface):
+        """Add 2014 bus/abstraction type references, mode and port maps."""
+        abstraction_type = self._add_type_refs(parent, bus_if)
+
+        # Interface mode (master/slave)
+        self._add_interface_mode(parent, bus_if, 'master', 'slave')
+
+        # Port maps
+        self._add_port_maps(abstraction_type, bus_if.port_maps)
+
+    def _add_bus_refs_2022(self, parent: etree.Element, bus_if: BusInterface):
+        """Add 2022 bus/abstraction type references, mode and port maps."""
+        abstraction_type = self._add_type_refs(parent, bus_if)
+
+        # Interface mode (initiator/target)
+        self._add_interface_mode(parent, bus_if, 'initiator', 'target')
+
+        # Port maps
+        self._add_port_maps(abstraction_type, bus_if.port_maps)
+
+    def _add_type_refs(self, parent: etree.Element, bus_if: BusInterface) -> etree.Element:
+        """Add 2014+ busType and abstractionTypes; return the abstractionType."""
+        t = self._tags
+        protocol = bus_if.protocol
+
+        # Bus type reference
+        etree.SubElement(parent, t['busType'], {
+            "vendor": protocol.vendor,
+            "library": protocol.library,
+            "name": protocol.name,
+            "version": protocol.version,
+        })
+
+        # Abstraction types
+        abstraction_types = etree.SubElement(parent, t['abstractionTypes'])
+        abstraction_type = etree.SubElement(abstraction_types, t['abstractionType'])
+
+        # Abstraction type reference
+        etree.SubElement(abstraction_type, t['abstractionRef'], {
+            "vendor": protocol.vendor,
+            "library": protocol.library,
+            "name": f"{protocol.name}_rtl",
+            "version": protocol.version,
+        })
+
+        return abstraction_type
+
+    def _add_interface_mode(self, parent: etree.Element, bus_if: BusInterface,
+                            master_mode: str, slave_mode: str):
+        """Add the interface mode element with its address space/memory map ref."""
+        t = self._tags
+        is_master = bus_if.interface_mode == 'master'
+
+        mode_elem = etree.SubElement(parent, t[master_mode if is_master else slave_mode])
+
+        if bus_if.protocol.is_addressable:
+            if is_master:
+                ref = etree.SubElement(mode_elem, t['addressSpaceRef'])
+                ref.set("addressSpaceRef", f"AS_{bus_if.name}")
             else:
-                # Bus type reference
-                bus_type = etree.SubElement(bus_interface_elem, f"{{{ns}}}busType")
-                bus_type.set("vendor", bus_if.protocol.vendor)
-                bus_type.set("library", bus_if.protocol.library)
-                bus_type.set("name", bus_if.protocol.name)
-                bus_type.set("version", bus_if.protocol.version)
-
-                # Abstraction types
-                abstraction_types = etree.SubElement(bus_interface_elem, f"{{{ns}}}abstractionTypes")
-                abstraction_type = etree.SubElement(abstraction_types, f"{{{ns}}}abstractionType")
-
-                # Abstraction type reference
-                abstraction_ref = etree.SubElement(abstraction_type, f"{{{ns}}}abstractionRef")
-                abstraction_ref.set("vendor", bus_if.protocol.vendor)
-                abstraction_ref.set("library", bus_if.protocol.library)
-                abstraction_ref.set("name", f"{bus_if.protocol.name}_rtl")
-                abstraction_ref.set("version", bus_if.protocol.version)
-
-                # Interface mode (master/slave)
-                mode_name = 'master' if bus_if.interface_mode == 'master' else 'slave'
-                mode_elem = etree.SubElement(bus_interface_elem, f"{{{ns}}}{mode_name}")
-
-                if bus_if.protocol.is_addressable:
-                    if bus_if.interface_mode == 'master':
-                        ref = etree.SubElement(mode_elem, f"{{{ns}}}addressSpaceRef")
-                        ref.set("addressSpaceRef", f"AS_{bus_if.name}")
-                    else:
-                        ref = etree.SubElement(mode_elem, f"{{{ns}}}memoryMapRef")
-                        ref.set("memoryMapRef", f"MM_{bus_if.name}")
-
-                # Port maps
-                port_maps = etree.SubElement(abstraction_type, f"{{{ns}}}portMaps")
-
-                for logical_name, physical_name in sorted(bus_if.port_maps.items()):
-                    port_map = etree.SubElement(port_maps, f"{{{ns}}}portMap")
-
-                    # Logical port
-                    logical_port = etree.SubElement(port_map, f"{{{ns}}}logicalPort")
-                    log_name = etree.SubElement(logical_port, f"{{{ns}}}name")
-                    log_name.text = logical_name
-
-                    # Physical port
-                    physical_port = etree.SubElement(port_map, f"{{{ns}}}physicalPort")
-                    phys_name = etree.SubElement(physical_port, f"{{{ns}}}name")
-                    phys_name.text = physical_name
-
-            # Add parameters for Clock and Reset interfaces
-            # Heuristic: check if protocol name contains 'Clock' or 'Reset'
-            is_clock = 'Clock' in bus_if.protocol.name
-            is_reset = 'Reset' in bus_if.protocol.name
-
-            if is_clock or is_reset:
-                parameters = etree.SubElement(bus_interface_elem, f"{{{ns}}}parameters")
-
-                if is_clock:
-                    param = etree.SubElement(parameters, f"{{{ns}}}parameter")
-                    name_elem = etree.SubElement(param, f"{{{ns}}}name")
-                    name_elem.text = "isClock"
-                    value_elem = etree.SubElement(param, f"{{{ns}}}value")
-                    value_elem.text = "true"
-
-                if is_reset:
-                    param = etree.SubElement(parameters, f"{{{ns}}}parameter")
-                    name_elem = etree.SubElement(param, f"{{{ns}}}name")
-                    name_elem.text = "isReset"
-                    value_elem = etree.SubElement(param, f"{{{ns}}}value")
-                    value_elem.text = "true"
-
-                    # For reset, we often want POLARITY. Defaulting to ACTIVE_LOW if n is in name
-                    # This is a guess, but helpful.
-                    polarity = "ACTIVE_LOW" if "_n" in bus_if.name.lower() else "ACTIVE_HIGH"
-                    param = etree.SubElement(parameters, f"{{{ns}}}parameter")
-                    name_elem = etree.SubElement(param, f"{{{ns}}}name")
-                    name_elem.text = "POLARITY"
-                    value_elem = etree.SubElement(param, f"{{{ns}}}value")
-                    value_elem.text = polarity
-
-            # Add bus parameters from SV parameters
-            # Heuristic: Look for parameters starting with interface name (case insensitive)
-            # e.g. M_AXI_ID_WIDTH -> ID_WIDTH for M_AXI interface
-            # Also handle C_ prefix (common in Xilinx IPs) e.g. C_M_AXI_ID_WIDTH
-
-            bus_params = {}
-            if_name_upper = bus_if.name.upper()
-
-            for param_name, param_value in self.module.parameters.items():
-                param_upper = param_name.upper()
-                suffix = None
-
-                # Check for direct prefix
-                if param_upper.startswith(if_name_upper + "_"):
-                    suffix = param_upper[len(if_name_upper)+1:]
-
-                # Check for C_ prefix
-                elif param_upper.startswith("C_" + if_name_upper + "_"):
-                    suffix = param_upper[len("C_" + if_name_upper)+1:]
-
-                if suffix:
-                    # Filter out common suffixes that might not be bus parameters if needed
-                    # For now, include everything
-                    bus_params[suffix] = param_name
-
-            if bus_params:
-                # Ensure parameters element exists (might have been created for clock/reset)
-                parameters = bus_interface_elem.find(f"{{{ns}}}parameters")
-                if parameters is None:
-                    parameters = etree.SubElement(bus_interface_elem, f"{{{ns}}}parameters")
-
-                for param_key, sv_param_name in sorted(bus_params.items()):
-                    param = etree.SubElement(parameters, f"{{{ns}}}parameter")
-                    name_elem = etree.SubElement(param, f"{{{ns}}}name")
-                    name_elem.text = param_key
-                    value_elem = etree.SubElement(param, f"{{{ns}}}value")
-                    value_elem.text = sv_param_name
+                ref = etree.SubElement(mode_elem, t['memoryMapRef'])
+                ref.set("memoryMapRef", f"MM_{bus_if.name}")
 
-    def _add_model(self, parent: etree.Element):
-        """Add model section with ports."""
-        ns = self.namespaces[self.ns_prefix]
+    def _add_port_maps(self, parent: etree.Element, port_maps: Dict[str, str]):
+        """Add portMaps section, ordered by logical port name."""
+        t = self._tags
 
-        model = etree.SubElement(parent, f"{{{ns}}}model")
-        views = etree.SubElement(model, f"{{{ns}}}views")
+        port_maps_elem = etree.SubElement(parent, t['portMaps'])
 
-        # Add RTL view
-        view = etree.SubElement(views, f"{{{ns}}}view")
-        view_name = etree.SubElement(view, f"{{{ns}}}name")
-        view_name.text = "rtl"
+        # Hoisted out of the per-map loop
+        sub = etree.SubElement
+        tag_port_map, tag_logical, tag_physical, tag_name = (
+            t['portMap'], t['logicalPort'], t['physicalPort'], t['name'])
 
-        if self.version == '2009':
-            env_identifier = etree.SubElement(view, f"{{{ns}}}envIdentifier")
-            env_identifier.text = "verilog:*:*"
-            language = etree.SubElement(view, f"{{{ns}}}language")
-            language.text = "systemVerilog"
-        else:
-            env_identifier = etree.SubElement(view, f"{{{ns}}}envIdentifier")
-            env_identifier.text = ":verilogSource:systemVerilog"
+        # Sort the keys only; values are fetched by name
+        for logical_name in sorted(port_maps):
+            port_map = sub(port_maps_elem, tag_port_map)
+
+            # Logical port
+            sub(sub(port_map, tag_logical), tag_name).text = logical_name
+
+            # Physical port
+            sub(sub(port_map, tag_physical), tag_name).text = port_maps[logical_name]
+
+    def _add_model(self, parent: etree.Element):
+        """Add model section with ports."""
+        t = self._tags
+
+        model = etree.SubElement(parent, t['model'])
+        self._add_views(model)
 
         # Add model parameters (only for 2009)
         if self.version == '2009' and self.module.parameters:
             self._add_model_parameters(model)
 
         # Add ports section
-        ports = etree.SubElement(model, f"{{{ns}}}ports")
+        ports = etree.SubElement(model, t['ports'])
 
         # Add all ports
+        add_port = self._add_port
         for port in self.module.ports:
-            self._add_port(ports, port)
+            add_port(ports, port)
+
+    def _add_views(self, parent: etree.Element):
+        """Add views section with the RTL view."""
+        t = self._tags
+
+        views = etree.SubElement(parent, t['views'])
+
+        # Add RTL view
+        view = etree.SubElement(views, t['view'])
+        view_name = etree.SubElement(view, t['name'])
+        view_name.text = "rtl"
+
+        if self.version == '2009':
+            env_identifier = etree.SubElement(view, t['envIdentifier'])
+            env_identifier.text = "verilog:*:*"
+            language = etree.SubElement(view, t['language'])
+            language.text = "systemVerilog"
+        else:
+            env_identifier = etree.SubElement(view, t['envIdentifier'])
+            env_identifier.text = ":verilogSource:systemVerilog"
 
     def _add_port(self, parent: etree.Element, port: PortDefinition):
         """Add a single port definition."""
-        ns = self.namespaces[self.ns_prefix]
+        t = self._tags
+        sub = etree.SubElement
 
-        port_elem = etree.SubElement(parent, f"{{{ns}}}port")
+        port_elem = sub(parent, t['port'])
 
         # Name
-        name = etree.SubElement(port_elem, f"{{{ns}}}name")
-        name.text = port.name
+        sub(port_elem, t['name']).text = port.name
 
         # Wire
-        wire = etree.SubElement(port_elem, f"{{{ns}}}wire")
+        wire = sub(port_elem, t['wire'])
 
         # Direction
-        direction = etree.SubElement(wire, f"{{{ns}}}direction")
-        if port.direction == 'input':
-            direction.text = 'in'
-        elif port.direction == 'output':
-            direction.text = 'out'
-        elif port.direction == 'inout':
-            direction.text = 'inout'
-        elif port.direction == 'interface':
-            direction.text = 'inout'  # Map interface ports to inout by default
+        sub(wire, t['direction']).text = _DIRECTION_MAP.get(port.direction)
 
         # Vector (if width > 1 or width is a string expression)
-        is_vector = False
-        if isinstance(port.width, int):
-            if port.width > 1:
-                is_vector = True
-        else:
-            # If width is a string (expression), it's a vector
-            is_vector = True
-
-        if is_vector:
-            if self.version == '2009':
-                vector = etree.SubElement(wire, f"{{{ns}}}vector")
-
-                left = etree.SubElement(vector, f"{{{ns}}}left")
-                left.text = str(port.msb if port.msb is not None else (port.width - 1 if isinstance(port.width, int) else 0))
-
-                right = etree.SubElement(vector, f"{{{ns}}}right")
-                right.text = str(port.lsb if port.lsb is not None else 0)
-            else:
-                vectors = etree.SubElement(wire, f"{{{ns}}}vectors")
-                vector = etree.SubElement(vectors, f"{{{ns}}}vector")
-
-                left = etree.SubElement(vector, f"{{{ns}}}left")
-                left.text = str(port.msb if port.msb is not None else (port.width - 1 if isinstance(port.width, int) else 0))
-
-                right = etree.SubElement(vector, f"{{{ns}}}right")
-                right.text = str(port.lsb if port.lsb is not None else 0)
+        bounds = port.vector_bounds()
+        if bounds is not None:
+            vector_parent = wire if self.version == '2009' else sub(wire, t['vectors'])
+            vector = sub(vector_parent, t['vector'])
+            sub(vector, t['left']).text = str(bounds[0])
+            sub(vector, t['right']).text = str(bounds[1])
 
         # Type definition (for custom types)
         if port.type_name:
-            wire_type_defs = etree.SubElement(wire, f"{{{ns}}}wireTypeDefs")
-            wire_type_def = etree.SubElement(wire_type_defs, f"{{{ns}}}wireTypeDef")
-
-            type_name_elem = etree.SubElement(wire_type_def, f"{{{ns}}}typeName")
-            type_name_elem.text = port.type_name
+            wire_type_defs = sub(wire, t['wireTypeDefs'])
+            wire_type_def = sub(wire_type_defs, t['wireTypeDef'])
+            sub(wire_type_def, t['typeName']).text = port.type_name
 
     def _add_model_parameters(self, parent: etree.Element):
         """Add modelParameters section."""
-        ns = self.namespaces[self.ns_prefix]
+        t = self._tags
 
-        model_params = etree.SubElement(parent, f"{{{ns}}}modelParameters")
+        model_params = etree.SubElement(parent, t['modelParameters'])
 
         for name, param_def in self.module.parameters.items():
-            param = etree.SubElement(model_params, f"{{{ns}}}modelParameter")
+            param = etree.SubElement(model_params, t['modelParameter'])
 
-            name_elem = etree.SubElement(param, f"{{{ns}}}name")
+            name_elem = etree.SubElement(param, t['name'])
             name_elem.text = name
 
-            value_elem = etree.SubElement(param, f"{{{ns}}}value")
+            value_elem = etree.SubElement(param, t['value'])
             value_elem.text = param_def.value
 
             # Data type
-            type_elem = etree.SubElement(param, f"{{{ns}}}dataType")
+            type_elem = etree.SubElement(param, t['dataType'])
             type_elem.text = param_def.type_name
 
     def _add_parameters(self, parent: etree.Element):
         """Add parameters section (for 2014+)."""
-        ns = self.namespaces[self.ns_prefix]
+        t = self._tags
 
-        params = etree.SubElement(parent, f"{{{ns}}}parameters")
+        params = etree.SubElement(parent, t['parameters'])
 
         for name, param_def in self.module.parameters.items():
-            param = etree.SubElement(params, f"{{{ns}}}parameter")
+            param = etree.SubElement(params, t['parameter'])
 
-            name_elem = etree.SubElement(param, f"{{{ns}}}name")
+            name_elem = etree.SubElement(param, t['name'])
             name_elem.text = name
 
-            value_elem = etree.SubElement(param, f"{{{ns}}}value")
+            value_elem = etree.SubElement(param, t['value'])
             value_elem.text = param_def.value
 
             # parameterId is optional but good practice if referenced
@@ -569,15 +566,7 @@ class IPXACTGenerator:
 
     def write_to_file(self, output_path: str):
         """Write generated IP-XACT to file."""
-        root = self.generate()
-
-        tree = etree.ElementTree(root)
-        tree.write(
-            output_path,
-            pretty_print=True,
-            xml_declaration=True,
-            encoding='UTF-8'
-        )
+        Path(output_path).write_bytes(self._serialize())
 
         print(f"IP-XACT file written to: {output_path}")
 
@@ -611,31 +600,40 @@ class IPXACTGenerator:
         return " ".join(command)
 
     def _validate_local_xml(self, xml_path: str) -> str:
-        """Validate the generated XML against a local schema."""
+        """Validate the generated XML against a local schema.
+
+        Returns the equivalent xmllint command, so the check can be rerun
+        by hand; the validation itself runs in-process with lxml.
+        """
         schema_dir = Path("schemas") / self.version
         schema_path = schema_dir / "index.xsd"
+        command = " ".join(["xmllint", "--noout", "--schema", str(schema_path), xml_path])
 
-        if not schema_path.exists():
+        if not self._schemas_ok(self.version, schema_dir):
             print(f"Local schema not found for version {self.version}. Downloading...")
             self._download_schemas(self.version, schema_dir)
 
-        command = ["xmllint", "--noout", "--schema", str(schema_path), xml_path]
         print(f"Validating '{xml_path}' against local schema {schema_path}...")
-        print(f"  Validation command: {" ".join(command)}")
         try:
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                check=True
-            )
+            schema = load_schema(str(schema_path.resolve()))
+        except (OSError, etree.LxmlError) as e:
+            print(f"Warning: could not load schema {schema_path}: {e}. Skipping validation.")
+            return command
+
+        # Validate the written file in-process (no xmllint), so errors keep
+        # the file name and line numbers
+        try:
+            document = etree.parse(xml_path)
+        except (OSError, etree.XMLSyntaxError) as e:
+            print(f"Validation failed: could not read {xml_path}: {e}")
+            return command
+
+        if schema.validate(document):
             print("Validation successful.")
-        except FileNotFoundError:
-            print("Warning: `xmllint` not found. Skipping validation.")
-        except subprocess.CalledProcessError as e:
+        else:
             print("Validation failed:")
-            print(e.stderr)
-        return " ".join(command)
+            print(schema.error_log)
+        return command
 
     def validate_file(self, output_path: str, validation_type: str) -> str:
         """Validate the generated IP-XACT file based on the validation type."""
@@ -647,18 +645,29 @@ class IPXACTGenerator:
 
     def to_string(self) -> str:
         """Get XML as string."""
-        root = self.generate()
+        return self._serialize().decode('utf-8')
+
+    def _serialize(self) -> bytes:
+        """Serialize the generated tree as a pretty-printed UTF-8 document."""
         return etree.tostring(
-            root,
+            self.generate(),
             pretty_print=True,
             xml_declaration=True,
             encoding='UTF-8'
-        ).decode('utf-8')
-
-    def _download_schemas(self, version: str, schema_dir: Path):
-        """Download schema files for the specified IP-XACT version."""
-        schema_dir.mkdir(parents=True, exist_ok=True)
+        )
 
+    @staticmethod
+    def _fetch(url: str, path: Path):
+        """Download a URL to a file, accepting a gzip-encoded response."""
+        request = urllib.request.Request(url, headers={'Accept-Encoding': 'gzip'})
+        with urllib.request.urlopen(request) as response:
+            data = response.read()
+            if response.headers.get('Content-Encoding') == 'gzip':
+                data = gzip.decompress(data)
+        path.write_bytes(data)
+
+    def _schema_downloads(self, version: str, schema_dir: Path) -> List[Tuple[str, Path]]:
+        """List (url, local path) pairs of the schema files for a version."""
         if version == '2009':
             base_url = 'http://www.spiritconsortium.org/XMLSchema/SPIRIT/1685-2009'
         elif version == '2022':
@@ -676,30 +685,56 @@ class IPXACTGenerator:
             # Remove typeDefinitions.xsd for 2014 version
             schema_files_to_download.remove("typeDefinitions.xsd")
 
-        for filename in schema_files_to_download:
-            url = f"{base_url}/{filename}"
-            path = schema_dir / filename
-            print(f"Downloading {url} to {path}...")
-            try:
-                urllib.request.urlretrieve(url, path)
-            except Exception as e:
-                print(f"Error downloading {filename}: {e}")
-                # Clean up partially downloaded files
-                if path.exists():
-                    path.unlink()
-                return
+        downloads = [(f"{base_url}/{filename}", schema_dir / filename)
+                     for filename in schema_files_to_download]
 
         if version == '2014' or version == '2022':
             # Download xml.xsd for 2014 and 2022 schemas
-            url = "https://www.w3.org/2001/xml.xsd"
-            path = schema_dir / "xml.xsd"
-            print(f"Downloading {url} to {path}...")
-            try:
-                urllib.request.urlretrieve(url, path)
-            except Exception as e:
-                print(f"Error downloading xml.xsd: {e}")
-                if path.exists():
-                    path.unlink()
-                return
+            downloads.append(("https://www.w3.org/2001/xml.xsd", schema_dir / "xml.xsd"))
+
+        return downloads
+
+    @staticmethod
+    def _is_present(path: Path) -> bool:
+        """Check that a schema file exists and is not empty."""
+        try:
+            return path.stat().st_size > 0
+        except OSError:
+            return False
+
+    def _schemas_ok(self, version: str, schema_dir: Path) -> bool:
+        """Check that every schema file for a version is present locally."""
+        return all(self._is_present(path)
+                   for _, path in self._schema_downloads(version, schema_dir))
+
+    def _download_schemas(self, version: str, schema_dir: Path):
+        """Download missing schema files for the specified IP-XACT version."""
+        schema_dir.mkdir(parents=True, exist_ok=True)
+
+        # Files kept from an earlier, possibly partial, download are reused
+        downloads = [(url, path) for url, path in self._schema_downloads(version, schema_dir)
+                     if not self._is_present(path)]
+
+        # Fetch concurrently so the total wait is close to the slowest file
+        failed = False
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = {}
+            for url, path in downloads:
+                print(f"Downloading {url} to {path}...")
+                futures[executor.submit(self._fetch, url, path)] = path
+
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"Error downloading {path.name}: {e}")
+                    # Clean up partially downloaded files
+                    if path.exists():
+                        path.unlink()
+                    failed = True
+
+        if failed:
+            return
 
         print("Schema download complete.")
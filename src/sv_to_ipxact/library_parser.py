@@ -2,13 +2,18 @@
 
 import os
 import json
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from dataclasses import dataclass
+from functools import lru_cache
 from lxml import etree
 
+from .compat import DATACLASS_SLOTS
 
-@dataclass
+
+# Slotted: a library holds thousands of signal definitions
+@dataclass(**DATACLASS_SLOTS)
 class SignalDefinition:
     """Definition of a signal in a bus protocol."""
     logical_name: str
@@ -19,8 +24,20 @@ class SignalDefinition:
     is_clock: bool = False
     is_reset: bool = False
 
+    def to_dict(self) -> dict:
+        """Get the fields as a plain dict (cheaper than ``asdict``)."""
+        return {
+            'logical_name': self.logical_name,
+            'description': self.description,
+            'direction': self.direction,
+            'width': self.width,
+            'presence': self.presence,
+            'is_clock': self.is_clock,
+            'is_reset': self.is_reset,
+        }
+
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ProtocolDefinition:
     """Definition of a bus protocol."""
     vendor: str
@@ -36,6 +53,84 @@ class ProtocolDefinition:
         """Get vendor:library:name:version identifier."""
         return f"{self.vendor}:{self.library}:{self.name}:{self.version}"
 
+    def to_dict(self) -> dict:
+        """Get the fields as a plain dict, with signals as dicts too."""
+        return {
+            'vendor': self.vendor,
+            'library': self.library,
+            'name': self.name,
+            'version': self.version,
+            'description': self.description,
+            'is_addressable': self.is_addressable,
+            'master_signals': [s.to_dict() for s in self.master_signals],
+            'slave_signals': [s.to_dict() for s in self.slave_signals],
+        }
+
+
+# Layout version of the JSON protocol cache written by save_cache
+_CACHE_FORMAT = 2
+
+
+def _signal_row(signal: SignalDefinition) -> list:
+    """Get a signal's fields in declaration order, for the protocol cache."""
+    return [signal.logical_name, signal.description, signal.direction,
+            signal.width, signal.presence, signal.is_clock, signal.is_reset]
+
+
+# Below this many bus definitions, worker start-up costs more than it saves
+_MIN_POOL_JOBS = 32
+
+# Parser settings for library files: drop whitespace-only text and comments
+# so there are fewer nodes to build and walk, and skip ID bookkeeping
+_PARSER_OPTIONS = dict(remove_blank_text=True, remove_comments=True,
+                       collect_ids=False, huge_tree=True)
+
+_FIELD_NAMES = (
+    'vendor', 'library', 'name', 'version', 'description', 'isAddressable',
+    'logicalName', 'onMaster', 'onSlave', 'presence', 'direction', 'width',
+)
+
+
+@lru_cache(maxsize=None)
+def _element_paths(ns_uri: str) -> Dict[str, str]:
+    """Map field names to descendant ElementPaths for a namespace.
+
+    ``port`` is the bare Clark tag, for use as an iterparse filter.
+    """
+    ns = f"{{{ns_uri}}}"
+    paths = {field: f'.//{ns}{field}' for field in _FIELD_NAMES}
+    paths['isClock'] = f'.//{ns}qualifier/{ns}isClock'
+    paths['isReset'] = f'.//{ns}qualifier/{ns}isReset'
+    paths['port'] = f'{ns}port'
+    return paths
+
+
+class _LibFile(NamedTuple):
+    """An XML file found while scanning the libs directory."""
+    path: Path
+    stem: str
+    is_rtl: bool
+    mtime: float
+
+
+def _parse_protocol_file(job: Tuple[Path, Optional[Path]]) -> Tuple[Optional[ProtocolDefinition], List[str]]:
+    """Parse one (bus definition, RTL abstraction) file pair in a worker process.
+
+    Workers do not print; log lines are returned so the parent can emit
+    them in file order.
+
+    Returns:
+        Tuple of (protocol or None, log lines)
+    """
+    bus_def_file, rtl_file = job
+    log: List[str] = []
+    try:
+        protocol = LibraryParser(str(bus_def_file.parent))._parse_protocol(bus_def_file, rtl_file, log)
+    except Exception as e:
+        log.append(f"  Error parsing {bus_def_file}: {e}")
+        protocol = None
+    return protocol, log
+
 
 class LibraryParser:
     """Parser for IP-XACT library XML files."""
@@ -43,68 +138,96 @@ class LibraryParser:
     def __init__(self, libs_dir: str = "libs"):
         self.libs_dir = Path(libs_dir)
         self.protocols: Dict[str, ProtocolDefinition] = {}
-
-    def parse_all_protocols(self) -> Dict[str, ProtocolDefinition]:
-        """Parse all protocol definitions in libs directory."""
+        self._entries: Optional[List[_LibFile]] = None
+        # Not shared across processes; each pool worker builds its own parser
+        self._parser = etree.XMLParser(**_PARSER_OPTIONS)
+
+    def parse_all_protocols(self, max_workers: Optional[int] = None) -> Dict[str, ProtocolDefinition]:
+        """Parse all protocol definitions in libs directory.
+
+        Files are parsed in worker processes; results and log lines are
+        collected in file order. Parsing stays in-process on single-CPU
+        machines and for small libraries, where the pool only adds cost.
+
+        Args:
+            max_workers: Number of worker processes (default: CPU count).
+                Use 1 to parse in-process, e.g. for debugging or when called
+                from a thread (the pool forks the process).
+        """
         print(f"Scanning {self.libs_dir} for protocol definitions...")
 
-        # Find all bus definition XML files (not _rtl.xml)
-        bus_def_files = []
-        for xml_file in self.libs_dir.rglob("*.xml"):
-            if not xml_file.name.endswith("_rtl.xml"):
-                bus_def_files.append(xml_file)
-
-        print(f"Found {len(bus_def_files)} bus definition files")
-
-        for bus_def_file in bus_def_files:
-            try:
-                protocol = self._parse_protocol(bus_def_file)
-                if protocol:
-                    vlnv = protocol.get_vlnv()
-                    self.protocols[vlnv] = protocol
-                    print(f"  Loaded: {vlnv}")
-            except Exception as e:
-                print(f"  Error parsing {bus_def_file}: {e}")
-
-        print(f"Successfully loaded {len(self.protocols)} protocols")
+        # Pair each bus definition (not _rtl.xml) with its RTL abstraction
+        entries = self._scan_libs()
+        rtl_files = {(e.path.parent, e.stem[:-4]): e.path for e in entries if e.is_rtl}
+        jobs = [(e.path, rtl_files.get((e.path.parent, e.stem)))
+                for e in entries if not e.is_rtl]
+
+        print(f"Found {len(jobs)} bus definition files")
+
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        if max_workers == 1 or len(jobs) < _MIN_POOL_JOBS:
+            results = map(_parse_protocol_file, jobs)
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(_parse_protocol_file, jobs, chunksize=8))
+
+        # Collect the per-file messages and write them in one call
+        lines = []
+        for protocol, log in results:
+            lines.extend(log)
+            if protocol:
+                vlnv = protocol.get_vlnv()
+                self.protocols[vlnv] = protocol
+                lines.append(f"  Loaded: {vlnv}")
+
+        lines.append(f"Successfully loaded {len(self.protocols)} protocols")
+        print("\n".join(lines))
         return self.protocols
 
-    def _parse_protocol(self, bus_def_file: Path) -> Optional[ProtocolDefinition]:
-        """Parse a single protocol definition."""
-        tree = etree.parse(str(bus_def_file))
+    def _parse_protocol(self, bus_def_file: Path, rtl_file: Optional[Path],
+                        log: Optional[List[str]] = None) -> Optional[ProtocolDefinition]:
+        """Parse a single protocol definition.
+
+        ``rtl_file`` is the matching RTL abstraction, or None if there is
+        none. Warnings are appended to ``log`` when given, otherwise printed.
+        """
+        tree = etree.parse(str(bus_def_file), self._parser)
         root = tree.getroot()
         nsmap = root.nsmap
 
-        # Determine the primary namespace prefix
+        # Determine the primary namespace
         if 'spirit' in nsmap:
-            ns_prefix = 'spirit'
+            ns_uri = nsmap['spirit']
         elif 'ipxact' in nsmap:
-            ns_prefix = 'ipxact'
+            ns_uri = nsmap['ipxact']
         else:
             # Fallback for files with no namespace prefix but a default namespace
             for prefix, uri in nsmap.items():
                 if '1685-2009' in uri or '1685-2014' in uri:
-                    nsmap['temp'] = uri
-                    ns_prefix = 'temp'
+                    ns_uri = uri
                     break
             else:
                 return None
+        paths = _element_paths(ns_uri)
 
         # Extract basic information from bus definition
-        vendor = self._get_text(root, f'.//{ns_prefix}:vendor', nsmap)
-        library = self._get_text(root, f'.//{ns_prefix}:library', nsmap)
-        name = self._get_text(root, f'.//{ns_prefix}:name', nsmap)
-        version = self._get_text(root, f'.//{ns_prefix}:version', nsmap)
-        description = self._get_text(root, f'.//{ns_prefix}:description', nsmap, default="")
-        is_addressable = self._get_text(root, f'.//{ns_prefix}:isAddressable', nsmap, default="false") == "true"
+        vendor = self._get_text(root, paths['vendor'])
+        library = self._get_text(root, paths['library'])
+        name = self._get_text(root, paths['name'])
+        version = self._get_text(root, paths['version'])
+        description = self._get_text(root, paths['description'], default="")
+        is_addressable = self._get_text(root, paths['isAddressable'], default="false") == "true"
 
         if not all([vendor, library, name, version]):
             return None
 
-        # Find corresponding RTL abstraction file
-        rtl_file = bus_def_file.parent / f"{bus_def_file.stem}_rtl.xml"
-        if not rtl_file.exists():
-            print(f"  Warning: No RTL definition found for {bus_def_file.name}")
+        if rtl_file is None:
+            message = f"  Warning: No RTL definition found for {bus_def_file.name}"
+            if log is None:
+                print(message)
+            else:
+                log.append(message)
             return ProtocolDefinition(
                 vendor=vendor,
                 library=library,
@@ -117,7 +240,7 @@ class LibraryParser:
             )
 
         # Parse RTL abstraction for signal definitions
-        master_signals, slave_signals = self._parse_rtl_definition(rtl_file, nsmap, ns_prefix)
+        master_signals, slave_signals = self._parse_rtl_definition(rtl_file, paths)
 
         return ProtocolDefinition(
             vendor=vendor,
@@ -130,39 +253,44 @@ class LibraryParser:
             slave_signals=slave_signals
         )
 
-    def _parse_rtl_definition(self, rtl_file: Path, nsmap: dict, ns_prefix: str) -> Tuple[List[SignalDefinition], List[SignalDefinition]]:
-        """Parse RTL abstraction definition to extract signal definitions."""
-        tree = etree.parse(str(rtl_file))
-        root = tree.getroot()
+    def _parse_rtl_definition(self, rtl_file: Path, paths: Dict[str, str]) -> Tuple[List[SignalDefinition], List[SignalDefinition]]:
+        """Parse RTL abstraction definition to extract signal definitions.
 
+        Ports are streamed with iterparse and cleared once read, so only
+        one port subtree is held in memory at a time.
+        """
         master_signals = []
         slave_signals = []
 
         # Parse all port definitions
-        for port in root.xpath(f'.//{ns_prefix}:port', namespaces=nsmap):
-            logical_name = self._get_text(port, f'.//{ns_prefix}:logicalName', nsmap)
-            if not logical_name:
-                continue
-
-            description = self._get_text(port, f'.//{ns_prefix}:description', nsmap, default="")
-
-            # Check if it's a clock or reset signal
-            is_clock = self._get_text(port, f'.//{ns_prefix}:qualifier/{ns_prefix}:isClock', nsmap, default="false") == "true"
-            is_reset = self._get_text(port, f'.//{ns_prefix}:qualifier/{ns_prefix}:isReset', nsmap, default="false") == "true"
-
-            # Parse master signals
-            on_master = port.find(f'.//{ns_prefix}:onMaster', namespaces=nsmap)
-            if on_master is not None:
-                signal = self._parse_signal_def(on_master, logical_name, description, is_clock, is_reset, nsmap, ns_prefix)
-                if signal:
-                    master_signals.append(signal)
-
-            # Parse slave signals
-            on_slave = port.find(f'.//{ns_prefix}:onSlave', namespaces=nsmap)
-            if on_slave is not None:
-                signal = self._parse_signal_def(on_slave, logical_name, description, is_clock, is_reset, nsmap, ns_prefix)
-                if signal:
-                    slave_signals.append(signal)
+        for _, port in etree.iterparse(str(rtl_file), events=("end",), tag=paths['port'],
+                                       **_PARSER_OPTIONS):
+            logical_name = self._get_text(port, paths['logicalName'])
+            if logical_name:
+                description = self._get_text(port, paths['description'], default="")
+
+                # Check if it's a clock or reset signal
+                is_clock = self._get_text(port, paths['isClock'], default="false") == "true"
+                is_reset = self._get_text(port, paths['isReset'], default="false") == "true"
+
+                # Parse master signals
+                on_master = port.find(paths['onMaster'])
+                if on_master is not None:
+                    signal = self._parse_signal_def(on_master, logical_name, description, is_clock, is_reset, paths)
+                    if signal:
+                        master_signals.append(signal)
+
+                # Parse slave signals
+                on_slave = port.find(paths['onSlave'])
+                if on_slave is not None:
+                    signal = self._parse_signal_def(on_slave, logical_name, description, is_clock, is_reset, paths)
+                    if signal:
+                        slave_signals.append(signal)
+
+            # Free the port and any siblings already processed
+            port.clear(keep_tail=True)
+            while port.getprevious() is not None:
+                del port.getparent()[0]
 
         # If no slave signals defined, mirror master signals
         if not slave_signals and master_signals:
@@ -188,11 +316,11 @@ class LibraryParser:
         return master_signals, slave_signals
 
     def _parse_signal_def(self, element, logical_name: str, description: str,
-                         is_clock: bool, is_reset: bool, nsmap: dict, ns_prefix: str) -> Optional[SignalDefinition]:
+                         is_clock: bool, is_reset: bool, paths: Dict[str, str]) -> Optional[SignalDefinition]:
         """Parse a single signal definition from onMaster/onSlave element."""
-        presence = self._get_text(element, f'.//{ns_prefix}:presence', nsmap, default="required")
-        direction = self._get_text(element, f'.//{ns_prefix}:direction', nsmap, default="")
-        width_str = self._get_text(element, f'.//{ns_prefix}:width', nsmap, default="1")
+        presence = self._get_text(element, paths['presence'], default="required")
+        direction = self._get_text(element, paths['direction'], default="")
+        width_str = self._get_text(element, paths['width'], default="1")
 
         try:
             width = int(width_str)
@@ -212,36 +340,37 @@ class LibraryParser:
             is_reset=is_reset
         )
 
-    def _get_text(self, element, xpath: str, nsmap: dict, default: str = None) -> Optional[str]:
-        """Get text content from an XPath query."""
-        result = element.xpath(xpath, namespaces=nsmap)
-        if result and len(result) > 0:
-            text = result[0].text
+    def _get_text(self, element, path: str, default: str = None) -> Optional[str]:
+        """Get text content of the first element matching an ElementPath."""
+        result = element.find(path)
+        if result is not None:
+            text = result.text
             return text.strip() if text else default
         return default
 
     def save_cache(self, cache_file: str = ".libs_cache.json"):
-        """Save parsed protocols to cache file."""
+        """Save parsed protocols to cache file.
+
+        Protocols and signals are stored as positional rows in compact JSON,
+        so loading needs no per-field dict lookups. JSON is used rather than
+        pickle because loading a pickle can run arbitrary code, and the cache
+        sits in the working directory.
+        """
         cache_data = {
-            'protocols': {
-                vlnv: {
-                    'vendor': p.vendor,
-                    'library': p.library,
-                    'name': p.name,
-                    'version': p.version,
-                    'description': p.description,
-                    'is_addressable': p.is_addressable,
-                    'master_signals': [asdict(s) for s in p.master_signals],
-                    'slave_signals': [asdict(s) for s in p.slave_signals]
-                }
-                for vlnv, p in self.protocols.items()
-            },
-            'libs_mtime': self._get_libs_mtime()
+            'format': _CACHE_FORMAT,
+            'libs_mtime': self._get_libs_mtime(),
+            'protocols': [
+                [p.vendor, p.library, p.name, p.version, p.description,
+                 p.is_addressable,
+                 [_signal_row(s) for s in p.master_signals],
+                 [_signal_row(s) for s in p.slave_signals]]
+                for p in self.protocols.values()
+            ],
         }
 
         cache_path = Path(cache_file)
         with open(cache_path, 'w') as f:
-            json.dump(cache_data, f, indent=2)
+            json.dump(cache_data, f, separators=(',', ':'))
 
         print(f"Cache saved to {cache_path}")
 
@@ -251,44 +380,66 @@ class LibraryParser:
         if not cache_path.exists():
             return False
 
-        # Check if cache is outdated
-        with open(cache_path, 'r') as f:
-            cache_data = json.load(f)
+        try:
+            with open(cache_path, 'r') as f:
+                cache_data = json.load(f)
+        except ValueError:
+            print("Cache is unreadable")
+            return False
 
-        cached_mtime = cache_data.get('libs_mtime', 0)
-        current_mtime = self._get_libs_mtime()
+        if not isinstance(cache_data, dict) or cache_data.get('format') != _CACHE_FORMAT:
+            print("Cache is outdated (cache format changed)")
+            return False
 
-        if current_mtime > cached_mtime:
+        # Check if cache is outdated
+        cached_mtime = cache_data.get('libs_mtime', 0)
+        if self._get_libs_mtime() > cached_mtime:
             print("Cache is outdated (libs/ directory modified)")
             return False
 
         # Load protocols from cache
-        self.protocols = {}
-        for vlnv, proto_data in cache_data['protocols'].items():
-            protocol = ProtocolDefinition(
-                vendor=proto_data['vendor'],
-                library=proto_data['library'],
-                name=proto_data['name'],
-                version=proto_data['version'],
-                description=proto_data['description'],
-                is_addressable=proto_data['is_addressable'],
-                master_signals=[SignalDefinition(**s) for s in proto_data['master_signals']],
-                slave_signals=[SignalDefinition(**s) for s in proto_data['slave_signals']]
-            )
-            self.protocols[vlnv] = protocol
+        try:
+            protocols = {}
+            for (vendor, library, name, version, description, is_addressable,
+                 master_rows, slave_rows) in cache_data['protocols']:
+                protocol = ProtocolDefinition(
+                    vendor, library, name, version, description, is_addressable,
+                    [SignalDefinition(*row) for row in master_rows],
+                    [SignalDefinition(*row) for row in slave_rows],
+                )
+                protocols[protocol.get_vlnv()] = protocol
+        except (KeyError, TypeError, ValueError):
+            print("Cache is unreadable")
+            return False
 
+        self.protocols = protocols
         print(f"Loaded {len(self.protocols)} protocols from cache")
         return True
 
+    def _scan_libs(self) -> List[_LibFile]:
+        """Walk the libs directory once and return its XML files.
+
+        The result is memoized, so parsing and the cache mtime check share
+        a single traversal.
+        """
+        if self._entries is None:
+            entries = []
+            pending = [self.libs_dir] if self.libs_dir.is_dir() else []
+            while pending:
+                subdirs = []
+                with os.scandir(pending.pop()) as it:
+                    for entry in it:
+                        if entry.is_dir():
+                            subdirs.append(Path(entry.path))
+                        elif entry.name.endswith(".xml"):
+                            stem = entry.name[:-4]
+                            entries.append(_LibFile(Path(entry.path), stem, stem.endswith("_rtl"),
+                                                    entry.stat().st_mtime))
+                # Depth-first, in directory order
+                pending.extend(reversed(subdirs))
+            self._entries = entries
+        return self._entries
+
     def _get_libs_mtime(self) -> float:
         """Get the latest modification time of any file in libs directory."""
-        if not self.libs_dir.exists():
-            return 0
-
-        latest_mtime = 0
-        for xml_file in self.libs_dir.rglob("*.xml"):
-            mtime = xml_file.stat().st_mtime
-            if mtime > latest_mtime:
-                latest_mtime = mtime
-
-        return latest_mtime
+        return max((e.mtime for e in self._scan_libs()), default=0)
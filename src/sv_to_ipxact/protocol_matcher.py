@@ -1,13 +1,72 @@
 """Protocol matching algorithm to identify bus interfaces from signals."""
 
 import re
-from typing import Dict, List, Tuple, Optional, Set
+import sys
+from typing import Dict, FrozenSet, List, Tuple, Optional, Set
 from dataclasses import dataclass
+from functools import lru_cache
 
 from .library_parser import ProtocolDefinition, SignalDefinition
 from .sv_parser import PortDefinition
 
 CAMEL_CASE_SPLIT_RE = re.compile(r'[A-Z]+(?=[A-Z][a-z0-9]|$)|[A-Z]?[a-z]+|[0-9]+')
+TRAILING_DIGITS_RE = re.compile(r'\d+$')
+
+
+# Direction bitmasks: a port and a signal are compatible when they share a
+# bit. Unknown port directions match nothing; unknown signal directions
+# only match inout ports.
+_PORT_DIR_MASK = {'input': 0b001, 'output': 0b010, 'inout': 0b111}
+_SIGNAL_DIR_MASK = {'in': 0b001, 'out': 0b010, 'inout': 0b011}
+_UNKNOWN_SIGNAL_DIR = 0b100
+
+
+@lru_cache(maxsize=4096)
+def _normalize(name: str) -> str:
+    """Uppercase a signal name and drop underscores."""
+    return name.upper().replace('_', '')
+
+
+@lru_cache(maxsize=8192)
+def _split_tokens(port_name: str) -> Tuple[str, ...]:
+    """Split a port name into meaningful tokens."""
+    if not port_name:
+        return ()
+
+    sanitized = port_name.replace('-', '_')
+    if '_' in sanitized:
+        parts = [part for part in sanitized.split('_') if part]
+    else:
+        parts = CAMEL_CASE_SPLIT_RE.findall(port_name)
+
+    return tuple(parts) or (port_name,)
+
+
+@lru_cache(maxsize=8192)
+def _suffix_candidates(port_name: str) -> Tuple[str, ...]:
+    """Every contiguous token slice of a port name, plus digit-trimmed variants."""
+    tokens = _split_tokens(port_name)
+    if not tokens:
+        return ()
+
+    candidates: List[str] = []
+    seen: Set[str] = set()
+
+    for start in range(len(tokens)):
+        for end in range(start, len(tokens)):
+            chunk_tokens = tokens[start:end + 1]
+            candidate = '_'.join(chunk_tokens)
+            if candidate and candidate not in seen:
+                candidates.append(candidate)
+                seen.add(candidate)
+
+            # Also consider variant with trailing digits removed
+            trimmed = TRAILING_DIGITS_RE.sub('', candidate)
+            if trimmed and trimmed not in seen:
+                candidates.append(trimmed)
+                seen.add(trimmed)
+
+    return tuple(candidates)
 
 
 @dataclass
@@ -46,22 +105,34 @@ class ProtocolMatcher:
     def __init__(self, protocols: Dict[str, ProtocolDefinition], config: Optional[MatchingConfig] = None):
         self.protocols = protocols
         self.config = config or MatchingConfig()
+        # (id(protocol), mode) -> (protocol, signal table), built on first use
+        self._signal_tables: Dict[Tuple[int, str], tuple] = {}
+        # Every normalized logical name in the library; suffix candidates
+        # outside this set can never match any protocol
+        self._known_names: Set[str] = {
+            _normalize(s.logical_name)
+            for p in protocols.values()
+            for signals in (p.master_signals, p.slave_signals)
+            for s in signals
+        }
 
     def match_port_group(self, prefix: str, ports: List[PortDefinition]) -> Optional[BusInterface]:
         """Try to match a group of ports to a bus protocol."""
         matches = []
+        candidates = self._port_candidates(ports)
+        group_norms = {norm for _, _, norms in candidates for norm in norms}
 
-        # Try to match against all known protocols
+        # Try to match against all known protocols, as master then slave
         for protocol in self.protocols.values():
-            # Try as master interface
-            master_score = self._calculate_match_score(ports, protocol, 'master')
-            if master_score and master_score.score >= self.config.match_threshold:
-                matches.append(master_score)
+            for mode in ('master', 'slave'):
+                # Skip protocols that cannot reach the threshold even if every
+                # shared signal name matched
+                if not self._could_match(protocol, mode, group_norms):
+                    continue
 
-            # Try as slave interface
-            slave_score = self._calculate_match_score(ports, protocol, 'slave')
-            if slave_score and slave_score.score >= self.config.match_threshold:
-                matches.append(slave_score)
+                score = self._calculate_match_score(ports, protocol, mode, candidates)
+                if score and score.score >= self.config.match_threshold:
+                    matches.append(score)
 
         if not matches:
             return None
@@ -93,46 +164,46 @@ class ProtocolMatcher:
 
     def _calculate_match_score(self, ports: List[PortDefinition],
                                protocol: ProtocolDefinition,
-                               mode: str) -> Optional[MatchScore]:
-        """Calculate how well a port group matches a protocol."""
-        # Get the signal definitions for this mode
-        signal_defs = protocol.master_signals if mode == 'master' else protocol.slave_signals
+                               mode: str,
+                               candidates: Optional[List[Tuple[PortDefinition, int, List[str]]]] = None
+                               ) -> Optional[MatchScore]:
+        """Calculate how well a port group matches a protocol.
 
-        if not signal_defs:
+        ``candidates`` are the precomputed ``_port_candidates(ports)``,
+        shared across protocols by ``match_port_group``.
+        """
+        table = self._signal_table(protocol, mode)
+        if table is None:
             return None
-
-        # Build a map of logical signal names (normalized)
-        logical_signals = {self._normalize_name(s.logical_name): s for s in signal_defs}
+        logical_signals, required_signals, optional_signals, _, _ = table
 
         # Try to match each port to a logical signal
         matched = {}
         port_names = {p.name for p in ports}
         remaining_ports = set(port_names)
 
-        # First pass: exact matches after normalization
-        for port in ports:
-            for candidate in self._get_port_suffix_candidates(port.name):
-                norm_suffix = self._normalize_name(candidate)
+        if candidates is None:
+            candidates = self._port_candidates(ports)
 
+        # First pass: exact matches after normalization
+        for port, port_mask, norm_suffixes in candidates:
+            for norm_suffix in norm_suffixes:
                 if norm_suffix not in logical_signals:
                     continue
 
-                signal_def = logical_signals[norm_suffix]
+                signal_def, signal_mask = logical_signals[norm_suffix]
 
                 # Avoid mapping the same logical signal more than once
                 if signal_def.logical_name in matched:
                     continue
 
                 # Check direction compatibility
-                if self._check_direction_compatible(port.direction, signal_def.direction, mode):
+                if port_mask & signal_mask:
                     matched[signal_def.logical_name] = port.name
                     remaining_ports.discard(port.name)
                     break
 
         # Calculate score
-        required_signals = [s for s in signal_defs if s.presence == 'required']
-        optional_signals = [s for s in signal_defs if s.presence == 'optional']
-
         matched_required = sum(1 for s in required_signals if s.logical_name in matched)
         matched_optional = sum(1 for s in optional_signals if s.logical_name in matched)
 
@@ -169,6 +240,76 @@ class ProtocolMatcher:
             unmatched_ports=list(remaining_ports)
         )
 
+    def _port_candidates(self, ports: List[PortDefinition]) -> List[Tuple[PortDefinition, int, List[str]]]:
+        """Get each port's direction mask and the normalized suffix candidates
+        that name a known signal.
+
+        Order is preserved, so the first candidate a protocol knows is the
+        same one the unfiltered candidate list would reach first.
+        """
+        result = []
+        for port in ports:
+            norms: List[str] = []
+            for candidate in self._get_port_suffix_candidates(port.name):
+                norm = _normalize(candidate)
+                if norm in self._known_names and norm not in norms:
+                    # Interned, so probes against the interned signal
+                    # lookups succeed on identity
+                    norms.append(sys.intern(norm))
+            result.append((port, _PORT_DIR_MASK.get(port.direction, 0), norms))
+        return result
+
+    def _could_match(self, protocol: ProtocolDefinition, mode: str, group_norms: Set[str]) -> bool:
+        """Check whether a protocol could score at or above the threshold.
+
+        The bound assumes every required/optional name the group shares with
+        the protocol matches and no port is left over, so it is never below
+        the real score.
+        """
+        table = self._signal_table(protocol, mode)
+        if table is None:
+            return False
+        _, required_signals, optional_signals, required_norms, optional_norms = table
+
+        if required_norms.isdisjoint(group_norms):
+            return False  # No required signal can match
+
+        bound = (len(required_norms & group_norms) / len(required_signals)) * self.config.required_weight
+        if optional_signals:
+            bound += (len(optional_norms & group_norms) / len(optional_signals)) * self.config.optional_weight
+        return bound >= self.config.match_threshold
+
+    def _signal_table(self, protocol: ProtocolDefinition, mode: str
+                      ) -> Optional[Tuple[Dict[str, Tuple[SignalDefinition, int]],
+                                          List[SignalDefinition], List[SignalDefinition],
+                                          FrozenSet[str], FrozenSet[str]]]:
+        """Get the normalized signal lookup (with direction masks), the
+        required/optional lists and their normalized name sets.
+
+        These depend only on the protocol and mode, so they are built once
+        and reused for every port group. Returns None if the mode has no
+        signals.
+        """
+        key = (id(protocol), mode)
+        entry = self._signal_tables.get(key)
+        if entry is None:
+            signal_defs = protocol.master_signals if mode == 'master' else protocol.slave_signals
+            table = None
+            if signal_defs:
+                required = [s for s in signal_defs if s.presence == 'required']
+                optional = [s for s in signal_defs if s.presence == 'optional']
+                table = (
+                    {sys.intern(_normalize(s.logical_name)): (s, _SIGNAL_DIR_MASK.get(s.direction, _UNKNOWN_SIGNAL_DIR))
+                     for s in signal_defs},
+                    required,
+                    optional,
+                    frozenset(_normalize(s.logical_name) for s in required),
+                    frozenset(_normalize(s.logical_name) for s in optional),
+                )
+            # Keep the protocol alive so its id cannot be reused
+            entry = self._signal_tables[key] = (protocol, table)
+        return entry[1]
+
     def _extract_signal_suffix(self, port_name: str) -> Optional[str]:
         """Return a heuristic best-effort suffix for backward compatibility."""
         candidates = self._get_port_suffix_candidates(port_name)
@@ -187,84 +328,31 @@ class ProtocolMatcher:
 
         return candidates[-1]
 
-    def _get_port_suffix_candidates(self, port_name: str) -> List[str]:
+    def _get_port_suffix_candidates(self, port_name: str) -> Tuple[str, ...]:
         """Generate possible suffix candidates from a port name.
 
         Generates every contiguous token slice (left/right) and digit-trimmed
         variants so that aggressive prefixes/suffixes do not prevent a match.
         """
+        return _suffix_candidates(port_name)
 
-        tokens = self._split_port_tokens(port_name)
-        if not tokens:
-            return []
-
-        candidates: List[str] = []
-        seen: Set[str] = set()
-
-        for start in range(len(tokens)):
-            for end in range(start, len(tokens)):
-                chunk_tokens = tokens[start:end + 1]
-                candidate = '_'.join(chunk_tokens)
-                if candidate and candidate not in seen:
-                    candidates.append(candidate)
-                    seen.add(candidate)
-
-                # Also consider variant with trailing digits removed
-                trimmed = re.sub(r'\d+$', '', candidate)
-                if trimmed and trimmed not in seen:
-                    candidates.append(trimmed)
-                    seen.add(trimmed)
-
-        return candidates
-
-    def _split_port_tokens(self, port_name: str) -> List[str]:
+    def _split_port_tokens(self, port_name: str) -> Tuple[str, ...]:
         """Split a port name into meaningful tokens."""
-        if not port_name:
-            return []
-
-        sanitized = port_name.replace('-', '_')
-        if '_' in sanitized:
-            parts = [part for part in sanitized.split('_') if part]
-        else:
-            parts = CAMEL_CASE_SPLIT_RE.findall(port_name)
-
-        return parts or [port_name]
+        return _split_tokens(port_name)
 
     def _normalize_name(self, name: str) -> str:
         """Normalize signal name for comparison."""
-        # Convert to uppercase and remove underscores
-        return name.upper().replace('_', '')
+        return _normalize(name)
 
     def _check_direction_compatible(self, port_direction: str,
                                     signal_direction: str,
                                     interface_mode: str) -> bool:
         """Check if port direction is compatible with signal direction."""
-        # For master interface:
-        #   - signal direction 'out' should be port 'output'
-        #   - signal direction 'in' should be port 'input'
-        # For slave interface:
-        #   - signal direction 'out' should be port 'output'
-        #   - signal direction 'in' should be port 'input'
-
-        # Note: in IP-XACT, directions are from the interface perspective
-        # master 'out' = master drives = output
-        # slave 'in' = slave receives from master = input
-
-        port_dir_map = {
-            'input': 'in',
-            'output': 'out',
-            'inout': 'inout'
-        }
-
-        port_dir = port_dir_map.get(port_direction)
-        if not port_dir:
-            return False
-
-        # Check compatibility
-        if port_dir == 'inout' or signal_direction == 'inout':
-            return True
-
-        return port_dir == signal_direction
+        # Directions are from the interface perspective for both modes:
+        # signal 'out' needs an output port, 'in' an input port, and
+        # 'inout' on either side is compatible with anything
+        return bool(_PORT_DIR_MASK.get(port_direction, 0)
+                    & _SIGNAL_DIR_MASK.get(signal_direction, _UNKNOWN_SIGNAL_DIR))
 
     def match_all_groups(self, port_groups: Dict[str, List[PortDefinition]]) -> Tuple[List[BusInterface], List[PortDefinition]]:
         """Match all port groups to protocols."""
@@ -70,6 +70,28 @@ class PortDefinition:
     type_name: Optional[str] = None
     modport: Optional[str] = None
 
+    def vector_bounds(self) -> Optional[Tuple[Union[int, str], Union[int, str]]]:
+        """Get the (left, right) vector bounds, or None for a scalar port.
+
+        A port is a vector when its width is greater than 1 or is a string
+        expression. Missing bounds default to ``width - 1`` (0 for expression
+        widths) and 0.
+
+        Examples:
+            >>> PortDefinition("data", "input", 8).vector_bounds()
+            (7, 0)
+            >>> PortDefinition("clk", "input", 1).vector_bounds() is None
+            True
+        """
+        width = self.width
+        if isinstance(width, int):
+            if width <= 1:
+                return None
+            left = self.msb if self.msb is not None else width - 1
+        else:
+            left = self.msb if self.msb is not None else 0
+        return left, (self.lsb if self.lsb is not None else 0)
+
     def get_prefix(self) -> Optional[str]:
         """Extract prefix from signal name for grouping related signals.
 
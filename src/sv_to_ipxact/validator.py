@@ -8,10 +8,22 @@ Supports IP-XACT versions: 2009 (SPIRIT), 2014, and 2022 (2021).
 import argparse
 import subprocess
 import sys
+from functools import lru_cache
 from pathlib import Path
 from lxml import etree
 
 
+@lru_cache(maxsize=None)
+def load_schema(schema_path: str) -> etree.XMLSchema:
+    """Parse and compile an XSD once per process.
+
+    Compiling a schema (with its includes) costs far more than validating
+    against it, so every caller shares this cache. Pass a resolved path so
+    the cache key does not depend on the working directory.
+    """
+    return etree.XMLSchema(etree.parse(schema_path))
+
+
 class IPXACTValidator:
     """Validator for IP-XACT XML files."""
 
@@ -149,8 +161,7 @@ class IPXACTValidator:
         print()
 
         try:
-            xmlschema_doc = etree.parse(str(schema_path))
-            xmlschema = etree.XMLSchema(xmlschema_doc)
+            xmlschema = load_schema(str(schema_path.resolve()))
             xmlschema.assertValid(self.tree)
             print("✓ Validation successful!")
             return True
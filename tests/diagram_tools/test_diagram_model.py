@@ -1,9 +1,11 @@
 """Tests for diagram_model module."""
 
+import sys
+
 import pytest
 from diagram_tools.diagram_model import (
     DiagramPort, DiagramBlock, DiagramConfig,
-    PortType, PortDirection
+    PortType, PortDirection, port_sort_key
 )
 
 
@@ -89,6 +91,23 @@ class TestDiagramPort:
         assert ports[0].name == "clk"
         assert ports[1].name == "io"
 
+    def test_port_sort_key_function(self):
+        """Test module-level sort key orders left side before outputs."""
+        out = DiagramPort("a_out", PortDirection.OUTPUT, PortType.SIGNAL)
+        bidir = DiagramPort("io", PortDirection.INOUT, PortType.BUS)
+        rst = DiagramPort("rst", PortDirection.INPUT, PortType.SIGNAL, is_reset=True)
+
+        ports = sorted([out, bidir, rst], key=port_sort_key)
+        assert [p.name for p in ports] == ["rst", "io", "a_out"]
+        assert port_sort_key(rst) == rst.sort_key
+
+    @pytest.mark.skipif(sys.version_info < (3, 10),
+                        reason="dataclass slots require Python 3.10+")
+    def test_uses_slots(self):
+        """Test that ports store fields in slots rather than a __dict__."""
+        port = DiagramPort("clk", PortDirection.INPUT, PortType.SIGNAL)
+        assert not hasattr(port, "__dict__")
+
 
 class TestDiagramBlock:
     """Tests for DiagramBlock class."""
@@ -126,6 +145,21 @@ class TestDiagramBlock:
         assert len(right) == 1
         assert right[0].name == "out"
 
+    def test_side_lists_follow_port_mutation(self):
+        """Test that the per-side port lists reflect later port changes."""
+        block = DiagramBlock(
+            name="test",
+            ports=[DiagramPort("data", PortDirection.INPUT, PortType.BUS)]
+        )
+
+        block.ports.append(
+            DiagramPort("clk", PortDirection.INPUT, PortType.SIGNAL, is_clock=True))
+        block.ports.append(DiagramPort("out", PortDirection.OUTPUT, PortType.SIGNAL))
+        block.ports[0].direction = PortDirection.OUTPUT
+
+        assert [p.name for p in block.left_ports] == ["clk"]
+        assert [p.name for p in block.right_ports] == ["data", "out"]
+
 
 class TestDiagramConfig:
     """Tests for DiagramConfig class."""
@@ -3,6 +3,7 @@
 import pytest
 import tempfile
 from pathlib import Path
+import xml.etree.ElementTree as ET
 
 from diagram_tools.diagram_model import (
     DiagramPort, DiagramBlock, DiagramConfig,
@@ -68,6 +69,19 @@ class TestSVGGenerator:
         assert "<?xml" in content
         assert "<svg" in content
 
+    def test_generate_is_well_formed(self, sample_block):
+        """Test that names needing escapes still give well-formed SVG."""
+        sample_block.name = "a<b&c"
+        sample_block.ports.append(
+            DiagramPort("io", PortDirection.INOUT, PortType.SIGNAL))
+        result = SVGGenerator().generate(sample_block)
+
+        root = ET.fromstring(result)
+        ns = "{http://www.w3.org/2000/svg}"
+        assert root.find(f"{ns}text").text == "a<b&c"
+        inout = [l for l in root.iter(f"{ns}line") if l.get("marker-start")]
+        assert len(inout) == 1
+
 
 class TestDrawioGenerator:
     """Tests for DrawioGenerator class."""
@@ -121,3 +135,29 @@ class TestDrawioGenerator:
         assert "strokeWidth=2" in result
         # Signal should have width 1
         assert "strokeWidth=1" in result
+
+    def test_pretty_output(self, sample_block):
+        """Test that the XML is only indented when pretty output is requested."""
+        compact = DrawioGenerator().generate(sample_block)
+        pretty = DrawioGenerator(pretty=True).generate(sample_block)
+
+        assert len(compact.splitlines()) == 2  # declaration, then one line
+
+        # Cells nest under mxfile/diagram/mxGraphModel/root, two spaces a level
+        lines = pretty.splitlines()
+        assert "      <root>" in lines
+        assert "        <mxCell id=\"0\"/>" in lines
+        assert any(line.startswith("          <mxGeometry ") for line in lines)
+        assert lines[-1] == "</mxfile>"
+
+    def test_port_line_style_is_escaped(self, sample_block):
+        """Test that port line styles are attribute-escaped in the template."""
+        config = DiagramConfig(port_stroke_color='"red"&')
+        result = DrawioGenerator(config).generate(sample_block)
+
+        root = ET.fromstring(result.encode())
+        edges = [c for c in root.iter("mxCell") if c.get("edge") == "1"]
+        assert len(edges) == len(sample_block.ports)
+        assert edges[0].get("style").endswith('strokeColor="red"&;')
+        assert [p.get("as") for p in edges[0].iter("mxPoint")] == [
+            "sourcePoint", "targetPoint"]
@@ -0,0 +1,110 @@
+"""Tests for IP-XACT diagram extractor."""
+
+import pytest
+
+from diagram_tools.diagram_model import PortType, PortDirection
+from diagram_tools.ipxact_diagram_extractor import IPXACTDiagramExtractor
+
+
+@pytest.fixture
+def component_file(tmp_path):
+    """Create a small IP-XACT 2014 component with one bus interface."""
+    component = """<?xml version="1.0" encoding="UTF-8"?>
+    <ipxact:component xmlns:ipxact="http://www.accellera.org/XMLSchema/IPXACT/1685-2014">
+      <ipxact:vendor>user</ipxact:vendor>
+      <ipxact:library>user</ipxact:library>
+      <ipxact:name>test_component</ipxact:name>
+      <ipxact:version>1.0</ipxact:version>
+      <ipxact:busInterfaces>
+        <ipxact:busInterface>
+          <ipxact:name>M_APB</ipxact:name>
+          <ipxact:busType vendor="amba.com" library="AMBA4" name="APB4" version="r0p0_0"/>
+          <ipxact:abstractionTypes>
+            <ipxact:abstractionType>
+              <ipxact:portMaps>
+                <ipxact:portMap>
+                  <ipxact:logicalPort><ipxact:name>PADDR</ipxact:name></ipxact:logicalPort>
+                  <ipxact:physicalPort><ipxact:name>M_APB_PADDR</ipxact:name></ipxact:physicalPort>
+                </ipxact:portMap>
+                <ipxact:portMap>
+                  <ipxact:logicalPort><ipxact:name>PSEL</ipxact:name></ipxact:logicalPort>
+                  <ipxact:physicalPort><ipxact:name>M_APB_PSEL</ipxact:name></ipxact:physicalPort>
+                </ipxact:portMap>
+              </ipxact:portMaps>
+            </ipxact:abstractionType>
+          </ipxact:abstractionTypes>
+          <ipxact:master/>
+        </ipxact:busInterface>
+      </ipxact:busInterfaces>
+      <ipxact:model>
+        <ipxact:ports>
+          <ipxact:port>
+            <ipxact:name>clk</ipxact:name>
+            <ipxact:wire><ipxact:direction>in</ipxact:direction></ipxact:wire>
+          </ipxact:port>
+          <ipxact:port>
+            <ipxact:name>M_APB_PADDR</ipxact:name>
+            <ipxact:wire><ipxact:direction>out</ipxact:direction></ipxact:wire>
+          </ipxact:port>
+          <ipxact:port>
+            <ipxact:name>M_APB_PSEL</ipxact:name>
+            <ipxact:wire><ipxact:direction>out</ipxact:direction></ipxact:wire>
+          </ipxact:port>
+          <ipxact:port>
+            <ipxact:name>irq</ipxact:name>
+            <ipxact:wire>
+              <ipxact:direction>out</ipxact:direction>
+              <ipxact:vector><ipxact:left>3</ipxact:left><ipxact:right>0</ipxact:right></ipxact:vector>
+            </ipxact:wire>
+          </ipxact:port>
+        </ipxact:ports>
+      </ipxact:model>
+    </ipxact:component>
+    """
+    path = tmp_path / "component.xml"
+    path.write_text(component)
+    return str(path)
+
+
+class TestIPXACTDiagramExtractor:
+    """Tests for IPXACTDiagramExtractor class."""
+
+    def test_extract_component_name(self, component_file):
+        """Test that the component name is taken from the VLNV."""
+        block = IPXACTDiagramExtractor().extract(component_file)
+        assert block.name == "test_component"
+
+    def test_extract_bus_interface(self, component_file):
+        """Test that bus interfaces become interface ports."""
+        block = IPXACTDiagramExtractor().extract(component_file)
+
+        interfaces = [p for p in block.ports if p.port_type == PortType.INTERFACE]
+        assert len(interfaces) == 1
+        assert interfaces[0].name == "M_APB"
+        assert interfaces[0].direction == PortDirection.OUTPUT
+        assert interfaces[0].protocol_name == "APB4"
+        assert interfaces[0].signal_count == 2
+
+    def test_extract_ports_excludes_bus_signals(self, component_file):
+        """Test that ports mapped to a bus interface are not listed again."""
+        block = IPXACTDiagramExtractor().extract(component_file)
+
+        names = [p.name for p in block.ports]
+        assert names == ["M_APB", "clk", "irq"]
+
+        irq = block.ports[2]
+        assert irq.port_type == PortType.BUS
+        assert irq.width == 4
+        assert block.ports[1].is_clock
+
+    def test_extract_many(self, component_file):
+        """Test that parallel extraction matches sequential extraction."""
+        extractor = IPXACTDiagramExtractor()
+        blocks = extractor.extract_many([component_file, component_file],
+                                        max_workers=2)
+
+        assert len(blocks) == 2
+        expected = extractor.extract(component_file)
+        for block in blocks:
+            assert block.name == expected.name
+            assert [p.name for p in block.ports] == [p.name for p in expected.ports]
@@ -0,0 +1,65 @@
+"""Tests for SystemVerilog diagram extractor."""
+
+import pytest
+
+from diagram_tools.diagram_model import PortDirection
+from diagram_tools.sv_diagram_extractor import SVDiagramExtractor
+
+
+@pytest.fixture
+def sv_file(tmp_path):
+    """Create a small SystemVerilog module."""
+    path = tmp_path / "counter.sv"
+    path.write_text(
+        "module counter (\n"
+        "    input  logic       clk,\n"
+        "    input  logic       rst_n,\n"
+        "    output logic [7:0] count\n"
+        ");\n"
+        "endmodule\n"
+    )
+    return path
+
+
+class TestSVDiagramExtractor:
+    """Tests for SVDiagramExtractor class."""
+
+    def test_extract_without_matching(self, sv_file):
+        """Test plain port conversion when protocol matching is off."""
+        block = SVDiagramExtractor().extract(str(sv_file), match_protocols=False)
+
+        assert block.name == "counter"
+        assert [p.name for p in block.left_ports] == ["clk", "rst_n"]
+        assert block.right_ports[0].direction == PortDirection.OUTPUT
+        assert block.right_ports[0].width == 8
+
+    def test_block_cache_hit_and_invalidation(self, sv_file, tmp_path, monkeypatch):
+        """Test that cached blocks are reused until the SV file changes."""
+        cache = str(tmp_path / "blocks.sqlite")
+        extractor = SVDiagramExtractor(block_cache=cache)
+
+        first = extractor.extract(str(sv_file), match_protocols=False)
+        with monkeypatch.context() as m:
+            # A cache hit must not re-extract
+            m.setattr(extractor, "_extract", None)
+            second = extractor.extract(str(sv_file), match_protocols=False)
+        assert second == first
+
+        sv_file.write_text(sv_file.read_text().replace("counter", "counter2"))
+        third = extractor.extract(str(sv_file), match_protocols=False)
+        assert third.name == "counter2"
+
+    def test_fingerprint_tracks_removed_library_files(self, sv_file, tmp_path):
+        """Test that deleting a library file changes the block fingerprint."""
+        libs = tmp_path / "libs"
+        libs.mkdir()
+        for name in ("A.xml", "B.xml"):
+            (libs / name).write_text("<x/>")
+
+        def fingerprint():
+            return SVDiagramExtractor(libs_dir=str(libs))._fingerprint(str(sv_file), True)
+
+        before = fingerprint()
+        assert fingerprint() == before
+        (libs / "A.xml").unlink()
+        assert fingerprint() != before
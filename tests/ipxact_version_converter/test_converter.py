@@ -36,3 +36,37 @@ def test_conversion_and_validation(start_version, target_version):
 
     # Validate the converted file against the target schema
     assert converter.validate(target_version) is True
+
+@pytest.mark.parametrize("start_version", VERSIONS)
+@pytest.mark.parametrize("target_version", VERSIONS)
+def test_conversion_drops_old_namespace(start_version, target_version):
+    """Test that no element still declares the source namespace."""
+    if start_version == target_version:
+        pytest.skip("Skipping same-version conversion test.")
+
+    sample_file = os.path.join(SAMPLES_DIR, f'sample_{start_version}.xml')
+    converter = IpxactConverter(sample_file)
+    converter.convert(target_version)
+
+    old_ns = NAMESPACES[start_version]
+    for element in converter.root.iter():
+        assert old_ns not in element.nsmap.values()
+
+def test_conversion_keeps_text_quoting_namespace(tmp_path):
+    """Test that element text mentioning the source URI is left alone."""
+    quoted = f'Declared as xmlns:spirit="{NAMESPACES["2009"]}"'
+    sample = tmp_path / 'quoted.xml'
+    sample.write_text(
+        f'<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<!-- header -->\n'
+        f'<spirit:component xmlns:spirit="{NAMESPACES["2009"]}">\n'
+        f'  <spirit:description>{quoted}</spirit:description>\n'
+        f'</spirit:component>\n'
+    )
+    converter = IpxactConverter(str(sample))
+    converter.convert('2014')
+
+    description = converter.root.find(f'{{{NAMESPACES["2014"]}}}description')
+    assert description.text == quoted
+    assert converter.root.prefix == 'spirit'
+    assert converter.root.getprevious().text == ' header '
@@ -0,0 +1,214 @@
+"""Tests for IP-XACT generator."""
+
+import gzip
+import io
+from pathlib import Path
+
+import pytest
+
+from sv_to_ipxact.sv_parser import (
+    ModuleDefinition, ParameterDefinition, PortDefinition
+)
+from sv_to_ipxact.library_parser import ProtocolDefinition
+from sv_to_ipxact.protocol_matcher import BusInterface
+from sv_to_ipxact.ipxact_generator import IPXACTGenerator
+
+
+@pytest.fixture
+def module():
+    """Create a small module definition."""
+    return ModuleDefinition(
+        name="counter",
+        parameters={},
+        ports=[
+            PortDefinition("clk", "input", 1),
+            PortDefinition("count", "output", 8, msb=7, lsb=0),
+        ],
+    )
+
+
+@pytest.fixture
+def apb_interface():
+    """Create an APB slave bus interface."""
+    protocol = ProtocolDefinition(
+        vendor="amba.com", library="AMBA4", name="APB4", version="r0p0_0",
+        description="", is_addressable=True, master_signals=[], slave_signals=[],
+    )
+    return BusInterface(
+        name="S_APB", protocol=protocol, interface_mode="slave",
+        port_maps={"PSEL": "S_APB_PSEL", "PADDR": "S_APB_PADDR"},
+    )
+
+
+class TestIPXACTGenerator:
+    """Tests for IPXACTGenerator class."""
+
+    def test_generate_returns_fresh_tree(self, module):
+        """Test that editing a generated tree does not leak into later output."""
+        generator = IPXACTGenerator(module, [], [])
+        root = generator.generate()
+        root.clear()
+
+        assert generator.generate() is not root
+        assert generator.to_string().count("<ipxact:port>") == 2
+
+    def test_write_to_file_matches_to_string(self, module, tmp_path):
+        """Test that file output is the same document as to_string."""
+        generator = IPXACTGenerator(module, [], [])
+        text = generator.to_string()
+
+        output = tmp_path / "counter.xml"
+        generator.write_to_file(str(output))
+        assert output.read_text(encoding="utf-8") == text
+
+    def test_output_follows_module_changes(self, module):
+        """Test that later calls pick up changes to the module."""
+        generator = IPXACTGenerator(module, [], [])
+        generator.to_string()
+
+        module.ports.append(PortDefinition("irq", "output", 1))
+
+        assert generator.to_string().count("<ipxact:port>") == 3
+
+    def test_bus_parameters_from_prefixed_module_parameters(self, module, apb_interface):
+        """Test that interface-prefixed SV parameters become bus parameters."""
+        module.parameters = {
+            "S_APB_ADDR_WIDTH": ParameterDefinition("S_APB_ADDR_WIDTH", "12"),
+            "C_S_APB_DATA_WIDTH": ParameterDefinition("C_S_APB_DATA_WIDTH", "32"),
+            "DEPTH": ParameterDefinition("DEPTH", "16"),
+        }
+        generator = IPXACTGenerator(module, [apb_interface], [])
+        root = generator.generate()
+
+        ns = generator.namespaces["ipxact"]
+        bus_if = root.find(f"{{{ns}}}busInterfaces/{{{ns}}}busInterface")
+        params = {
+            p.findtext(f"{{{ns}}}name"): p.findtext(f"{{{ns}}}value")
+            for p in bus_if.iterfind(f"{{{ns}}}parameters/{{{ns}}}parameter")
+        }
+        assert params == {
+            "ADDR_WIDTH": "S_APB_ADDR_WIDTH",
+            "DATA_WIDTH": "C_S_APB_DATA_WIDTH",
+        }
+        ref = bus_if.find(f".//{{{ns}}}abstractionRef")
+        assert ref.get("name") == "APB4_rtl"
+
+    def test_port_maps_sorted_by_logical_name(self, module, apb_interface):
+        """Test that port maps are sorted by logical name and keep their text."""
+        apb_interface.port_maps["PWDATA"] = "wdata<&>"
+        generator = IPXACTGenerator(module, [apb_interface], [])
+        root = generator.generate()
+
+        ns = generator.namespaces["ipxact"]
+        port_maps = root.find(f".//{{{ns}}}portMaps")
+        assert [m.findtext(f"{{{ns}}}logicalPort/{{{ns}}}name") for m in port_maps] == [
+            "PADDR", "PSEL", "PWDATA"]
+        assert port_maps[2].findtext(f"{{{ns}}}physicalPort/{{{ns}}}name") == "wdata<&>"
+
+    def test_download_schemas_fetches_all_files(self, module, tmp_path, monkeypatch):
+        """Test that every schema file for the version is downloaded."""
+        fetched = []
+
+        def fake_fetch(url, path):
+            fetched.append(url)
+            path.write_text("<xs:schema/>")
+
+        monkeypatch.setattr(IPXACTGenerator, "_fetch", staticmethod(fake_fetch))
+        generator = IPXACTGenerator(module, [], [])
+        generator._download_schemas("2014", tmp_path)
+
+        expected = len(IPXACTGenerator.XSD_FILES)  # minus typeDefinitions, plus xml.xsd
+        assert len(fetched) == expected
+        assert (tmp_path / "index.xsd").exists()
+        assert (tmp_path / "xml.xsd").exists()
+
+    def test_download_schemas_removes_failed_files(self, module, tmp_path, monkeypatch):
+        """Test that a failed download does not leave a partial file."""
+        def fake_fetch(url, path):
+            path.write_text("partial")
+            if path.name == "port.xsd":
+                raise OSError("connection reset")
+
+        monkeypatch.setattr(IPXACTGenerator, "_fetch", staticmethod(fake_fetch))
+        generator = IPXACTGenerator(module, [], [])
+        generator._download_schemas("2014", tmp_path)
+
+        assert not (tmp_path / "port.xsd").exists()
+        assert (tmp_path / "index.xsd").exists()
+
+    def test_download_schemas_skips_present_files(self, module, tmp_path, monkeypatch):
+        """Test that only missing or empty schema files are downloaded again."""
+        generator = IPXACTGenerator(module, [], [])
+        for _, path in generator._schema_downloads("2009", tmp_path):
+            path.write_text("<xs:schema/>")
+        (tmp_path / "port.xsd").write_text("")
+        assert not generator._schemas_ok("2009", tmp_path)
+
+        fetched = []
+
+        def fake_fetch(url, path):
+            fetched.append(path.name)
+            path.write_text("<xs:schema/>")
+
+        monkeypatch.setattr(IPXACTGenerator, "_fetch", staticmethod(fake_fetch))
+        generator._download_schemas("2009", tmp_path)
+
+        assert fetched == ["port.xsd"]
+        assert generator._schemas_ok("2009", tmp_path)
+
+    @pytest.mark.parametrize("component_type, expected", [
+        ("lax", "Validation successful."),
+        ("xs:string", "Validation failed:"),
+    ])
+    def test_validate_local_in_process(self, module, tmp_path, monkeypatch, capsys,
+                                       component_type, expected):
+        """Test that local validation checks the written file with lxml."""
+        monkeypatch.chdir(tmp_path)
+        generator = IPXACTGenerator(module, [], [])
+        schema_dir = tmp_path / "schemas" / "2014"
+        schema_dir.mkdir(parents=True)
+        for _, path in generator._schema_downloads("2014", schema_dir):
+            path.write_text("<placeholder/>")
+
+        if component_type == "lax":
+            component = (
+                '<xs:element name="component"><xs:complexType><xs:sequence>'
+                '<xs:any processContents="skip" minOccurs="0" maxOccurs="unbounded"/>'
+                '</xs:sequence><xs:anyAttribute processContents="skip"/>'
+                '</xs:complexType></xs:element>'
+            )
+        else:
+            component = f'<xs:element name="component" type="{component_type}"/>'
+        (schema_dir / "index.xsd").write_text(
+            '<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" '
+            'targetNamespace="http://www.accellera.org/XMLSchema/IPXACT/1685-2014" '
+            f'elementFormDefault="qualified">{component}</xs:schema>'
+        )
+
+        generator.write_to_file("counter.xml")
+        command = generator.validate_file("counter.xml", "local")
+        out = capsys.readouterr().out
+        assert command == f"xmllint --noout --schema {Path('schemas/2014/index.xsd')} counter.xml"
+        assert expected in out
+        if component_type != "lax":
+            # Errors point at the written file and line
+            assert "counter.xml:2:" in out
+
+    @pytest.mark.parametrize("encoding", [None, "gzip"])
+    def test_fetch_decodes_gzip(self, tmp_path, monkeypatch, encoding):
+        """Test that schema fetches ask for gzip and decode it transparently."""
+        body = b"<xs:schema/>"
+        requests = []
+
+        class FakeResponse(io.BytesIO):
+            headers = {"Content-Encoding": encoding} if encoding else {}
+
+        def fake_urlopen(request):
+            requests.append(request)
+            return FakeResponse(gzip.compress(body) if encoding else body)
+
+        monkeypatch.setattr("urllib.request.urlopen", fake_urlopen)
+        IPXACTGenerator._fetch("http://example.com/index.xsd", tmp_path / "index.xsd")
+
+        assert requests[0].get_header("Accept-encoding") == "gzip"
+        assert (tmp_path / "index.xsd").read_bytes() == body
@@ -2,9 +2,12 @@
 
 import pytest
 import json
+import os
 import tempfile
+from dataclasses import asdict
 from pathlib import Path
 
+from sv_to_ipxact import library_parser
 from sv_to_ipxact.library_parser import (
     LibraryParser,
     ProtocolDefinition,
@@ -32,6 +35,11 @@ class TestSignalDefinition:
         assert signal.width == 32
         assert signal.presence == "required"
 
+    def test_to_dict_matches_asdict(self):
+        """Test that to_dict returns the same mapping as dataclasses.asdict."""
+        signal = SignalDefinition("AWADDR", "Address", "out", 32, "required", is_clock=True)
+        assert signal.to_dict() == asdict(signal)
+
 
 class TestProtocolDefinition:
     """Tests for ProtocolDefinition class."""
@@ -60,6 +68,7 @@ class TestProtocolDefinition:
         assert protocol.name == "AXI4"
         assert len(protocol.master_signals) == 1
         assert protocol.get_vlnv() == "amba.com:AMBA4:AXI4:r0p0_0"
+        assert protocol.to_dict() == asdict(protocol)
 
 
 class TestLibraryParser:
@@ -142,6 +151,35 @@ class TestLibraryParser:
         assert protocol.version == "v1.0"
         assert not protocol.is_addressable
 
+    def test_parse_in_process_matches_pool(self, mock_libs_dir, capsys, monkeypatch):
+        """Test that in-process parsing matches worker-process parsing."""
+        monkeypatch.setattr(library_parser, "_MIN_POOL_JOBS", 0)
+        pooled = LibraryParser(mock_libs_dir).parse_all_protocols(max_workers=2)
+        pooled_out = capsys.readouterr().out
+        serial = LibraryParser(mock_libs_dir).parse_all_protocols(max_workers=1)
+
+        assert serial == pooled
+        assert capsys.readouterr().out == pooled_out
+        assert "  Loaded: test.com:TEST:SimpleProtocol:v1.0" in pooled_out
+
+    def test_small_library_parsed_in_process(self, mock_libs_dir, monkeypatch):
+        """Test that a library below the pool threshold starts no workers."""
+        monkeypatch.setattr(library_parser, "ProcessPoolExecutor", None)
+        protocols = LibraryParser(mock_libs_dir).parse_all_protocols(max_workers=4)
+
+        assert "test.com:TEST:SimpleProtocol:v1.0" in protocols
+
+    def test_missing_rtl_definition(self, mock_libs_dir, capsys):
+        """Test that a bus definition without an RTL file has no signals."""
+        rtl_files = list(Path(mock_libs_dir).rglob("*_rtl.xml"))
+        rtl_files[0].unlink()
+
+        protocols = LibraryParser(mock_libs_dir).parse_all_protocols(max_workers=1)
+
+        protocol = list(protocols.values())[0]
+        assert protocol.master_signals == []
+        assert "No RTL definition found for SimpleProtocol.xml" in capsys.readouterr().out
+
     def test_parse_rtl_signals(self, mock_libs_dir):
         """Test parsing RTL signal definitions."""
         parser = LibraryParser(mock_libs_dir)
@@ -179,6 +217,39 @@ class TestLibraryParser:
         assert loaded
         assert len(parser2.protocols) == len(parser.protocols)
 
+    def test_cache_round_trip(self, mock_libs_dir, tmp_path):
+        """Test that the cache round-trips and detects outdated libs."""
+        parser = LibraryParser(mock_libs_dir)
+        parser.parse_all_protocols(max_workers=1)
+
+        cache_file = str(tmp_path / "test_cache.json")
+        parser.save_cache(cache_file)
+
+        parser2 = LibraryParser(mock_libs_dir)
+        assert parser2.load_cache(cache_file)
+        assert parser2.protocols == parser.protocols
+
+        # A newer libs file makes the cache outdated
+        rtl_file = next(Path(mock_libs_dir).rglob("*_rtl.xml"))
+        mtime = rtl_file.stat().st_mtime + 10
+        os.utime(rtl_file, (mtime, mtime))
+        assert not LibraryParser(mock_libs_dir).load_cache(cache_file)
+
+    @pytest.mark.parametrize("content", [
+        "not json",
+        "[1, 2]",
+        '{"protocols": {}, "libs_mtime": 1e30}',
+        '{"format": 2, "protocols": [{"vendor": "x"}], "libs_mtime": 1e30}',
+    ])
+    def test_malformed_cache_rejected(self, mock_libs_dir, tmp_path, content):
+        """Test that a cache of the wrong shape is rejected, not half-loaded."""
+        cache_file = tmp_path / "test_cache.json"
+        cache_file.write_text(content)
+
+        parser = LibraryParser(mock_libs_dir)
+        assert not parser.load_cache(str(cache_file))
+        assert parser.protocols == {}
+
     def test_cache_invalidation(self, mock_libs_dir, tmp_path):
         """Test cache invalidation when libs are modified."""
         parser = LibraryParser(mock_libs_dir)
@@ -54,6 +54,32 @@ class TestProtocolMatcher:
         assert "AWADDR" in matcher._get_port_suffix_candidates("M_AXI_AWADDR_M0")
         assert "awaddr" in matcher._get_port_suffix_candidates("axi_awaddr0")
 
+    def test_signal_table_reused(self, matcher, simple_protocol):
+        """Signal lookups are built once per protocol and mode."""
+        table = matcher._signal_table(simple_protocol, 'master')
+        lookup, required, optional, required_norms, _ = table
+
+        assert set(lookup) == {"DATA", "VALID", "READY"}
+        assert len(required) == 3
+        assert required_norms == {"DATA", "VALID", "READY"}
+        assert optional == []
+        assert matcher._signal_table(simple_protocol, 'master') is table
+        assert matcher._signal_table(simple_protocol, 'slave') is not table
+
+    def test_port_candidates_known_names_only(self, matcher):
+        """Candidates are normalized, deduplicated and limited to known signals."""
+        port = PortDefinition("M_SIMPLE_DATA_VALID", "output", 1)
+        [(_, mask, norms)] = matcher._port_candidates([port])
+
+        assert mask == 0b10
+        assert norms == ["DATA", "VALID"]
+
+    def test_could_match_bound(self, matcher, simple_protocol):
+        """Protocols are skipped only when the threshold is out of reach."""
+        assert matcher._could_match(simple_protocol, 'master', {"DATA", "VALID"})
+        assert not matcher._could_match(simple_protocol, 'master', {"DATA"})
+        assert not matcher._could_match(simple_protocol, 'master', {"ADDR"})
+
     def test_direction_compatibility(self, matcher):
         """Test direction compatibility checking."""
         # Master interface: out signal should be output port
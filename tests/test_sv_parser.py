@@ -41,6 +41,14 @@ class TestPortDefinition:
         port = PortDefinition("clk", "input", 1)
         assert port.get_prefix() is None
 
+    def test_vector_bounds(self):
+        """Test vector bounds for scalar, sized and parametric ports."""
+        assert PortDefinition("clk", "input", 1).vector_bounds() is None
+        assert PortDefinition("data", "output", 32).vector_bounds() == (31, 0)
+        assert PortDefinition("addr", "input", 8, 15, 8).vector_bounds() == (15, 8)
+        port = PortDefinition("bus", "input", "WIDTH", msb="WIDTH-1", lsb=0)
+        assert port.vector_bounds() == ("WIDTH-1", 0)
+
 
 class TestModuleDefinition:
     """Tests for ModuleDefinition class."""
@@ -0,0 +1,20 @@
+"""Unit tests for the IP-XACT validator."""
+
+import os
+
+from ipxact_version_converter.converter import IpxactConverter
+from sv_to_ipxact.validator import IPXACTValidator, load_schema
+
+SAMPLES_DIR = os.path.join(os.path.dirname(__file__), 'ipxact_version_converter')
+
+
+def test_load_schema_shared_across_validators():
+    """Test that repeated validation compiles each schema only once."""
+    sample_file = os.path.join(SAMPLES_DIR, 'sample_2014.xml')
+
+    assert IPXACTValidator(sample_file).validate_local() is True
+    hits = load_schema.cache_info().hits
+    assert IPXACTValidator(sample_file).validate_local() is True
+    # The converter validates against the same component.xsd
+    assert IpxactConverter(sample_file).validate('2014') is True
+    assert load_schema.cache_info().hits == hits + 2